@@ -21,8 +21,13 @@ A modern Siri-inspired desktop assistant with voice interaction, news, weather,
 
 import sys
 import os
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter, deque
+from itertools import islice
 from PyQt5.QtWidgets import QApplication, QMainWindow, QStackedWidget
-from PyQt5.QtCore import QTimer, Qt, QPropertyAnimation, QRect, QDateTime
+from PyQt5.QtCore import QTimer, Qt, QPropertyAnimation, QRect, QDateTime, QObject, pyqtSignal
 from PyQt5.QtGui import QFont, QIcon
 from dotenv import load_dotenv
 
@@ -30,26 +35,75 @@ from dotenv import load_dotenv
 from ui.main_window import MainWindow
 from modules.speech_recognition_module import SpeechRecognitionModule
 from modules.text_to_speech_module import TextToSpeechModule
-from modules.news_module import NewsModule
-from modules.weather_module import WeatherModule
-from modules.ai_module import AIModule
 from utils.config import AppConfig
 
 # Load environment variables
 load_dotenv()
 
+# Intent keywords, matched against the set of words in a command
+_WEATHER_KW = frozenset({"weather", "temperature", "forecast"})
+_NEWS_KW = frozenset({"news", "headlines", "latest"})
+_REMINDER_KW = frozenset({"remind", "reminder", "reminders", "schedule"})
+_TIME_KW = frozenset({"time", "date", "day", "today"})
+_HELP_KW = frozenset({"help", "command", "commands"})
+_HELP_PHRASES = ("what can you do",)
+
+# System command keywords
+_EXIT_KW = frozenset({"exit", "quit", "close", "shutdown"})
+_HISTORY_KW = frozenset({"history"})
+_HISTORY_PHRASES = ("previous commands", "what did i say")
+
+# Prefixes that mark a direct command, longest first so the most specific one is stripped
+_CMD_PREFIXES = tuple(sorted(("computer", "assistant", "hey assistant", "execute", "run"), key=len, reverse=True))
+
+# QDateTime formats for history timestamps and spoken time/date
+_TS_FMT = "yyyy-MM-dd hh:mm:ss"
+_TIME_FMT = "hh:mm AP"
+_DATE_FMT = "dddd, MMMM d, yyyy"
+
+# Filler words speech recognition returns for non-speech noise
+_NOISE_WORDS = frozenset({"uh", "um", "hmm", "hm", "ah", "er", "mm"})
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+def _tokenize(text_lower):
+    """Split lowercased text into a set of words, ignoring punctuation"""
+    return frozenset(_WORD_RE.findall(text_lower))
+
+
+class MainThreadInvoker(QObject):
+    """Calls functions on the thread that created it, for callbacks from worker threads"""
+
+    invoke = pyqtSignal(object, object)
+
+    def __init__(self):
+        super().__init__()
+        # Emits from other threads are queued to this object's (the main) thread
+        self.invoke.connect(self._call)
+
+    def _call(self, func, arg):
+        func(arg)
+
+    def wrap(self, func):
+        """Return a one-argument callback that runs func on the main thread"""
+        return lambda arg: self.invoke.emit(func, arg)
+
 
 class AIAssistantApp:
     """Main application class that initializes and connects all modules"""
 
     def __init__(self):
+        # Load configuration; the file is read in the background while Qt starts up
+        self.config = AppConfig()
+
         # Initialize application
         self.app = QApplication(sys.argv)
         self.app.setApplicationName("AI Desktop Assistant")
         self.app.setStyle("Fusion")  # Use Fusion style for a modern look
 
-        # Load configuration
-        self.config = AppConfig()
+        # Configure logging; debug output from the modules is skipped below this level
+        logging.basicConfig(level=self.config.get("general", "log_level", "WARNING"))
 
         # Initialize main window
         self.main_window = MainWindow(self.config)
@@ -64,9 +118,9 @@ class AIAssistantApp:
         self.app.setWindowIcon(QIcon(os.path.join("assets", "icons", "app_icon.png")))
 
         # Command tracking
-        self.command_history = []
         self.max_history_size = 20  # Store last 20 commands
-        self.recent_intents = {}
+        self.command_history = deque(maxlen=self.max_history_size)
+        self.recent_intents = Counter()
 
         # Listening state management
         self.is_listening_enabled = False
@@ -76,25 +130,60 @@ class AIAssistantApp:
 
     def init_modules(self):
         """Initialize all assistant modules"""
+        # Module requests with callbacks run here; their results come back through the invoker.
+        # Both must exist before the constructors below are submitted, as they pass the pool on
+        self._request_pool = ThreadPoolExecutor(max_workers=4)
+        self._invoker = MainThreadInvoker()
+
+        # News, weather and AI modules don't touch Qt, so build them concurrently in the
+        # background while the Qt-owned modules are created here; the properties below
+        # wait for them on first use
+        self._module_pool = ThreadPoolExecutor(max_workers=3)
+        self._module_futures = {
+            name: self._module_pool.submit(self.create_module, name)
+            for name in ("news", "weather", "ai")
+        }
+        self._module_pool.shutdown(wait=False)
+
         # Speech recognition module
         self.speech_module = SpeechRecognitionModule(self.config)
 
         # Text-to-speech module
         self.tts_module = TextToSpeechModule(self.config)
 
-        # News module
-        self.news_module = NewsModule(self.config)
-
-        # Weather module
-        self.weather_module = WeatherModule(self.config)
-
-        # AI module for answering questions
-        self.ai_module = AIModule(self.config)
+    def create_module(self, name):
+        """Import and construct one of the non-Qt modules"""
+        if name == "news":
+            from modules.news_module import NewsModule
+            return NewsModule(self.config, executor=self._request_pool)
+        elif name == "weather":
+            from modules.weather_module import WeatherModule
+            return WeatherModule(self.config, executor=self._request_pool)
+        elif name == "ai":
+            from modules.ai_module import AIModule
+            return AIModule(self.config, executor=self._request_pool)
+        raise ValueError(f"Unknown module: {name}")
+
+    @property
+    def news_module(self):
+        """News module, waiting for its background construction if needed"""
+        return self._module_futures["news"].result()
+
+    @property
+    def weather_module(self):
+        """Weather module, waiting for its background construction if needed"""
+        return self._module_futures["weather"].result()
+
+    @property
+    def ai_module(self):
+        """AI module for answering questions, waiting for its background construction if needed"""
+        return self._module_futures["ai"].result()
 
     def connect_signals(self):
         """Connect signals and slots between UI and modules"""
         # Connect speech recognition signals
         self.speech_module.text_recognized.connect(self.main_window.on_speech_recognized)
+        self.speech_module.partial_recognized.connect(self.main_window.on_partial_recognized)
         self.speech_module.listening_started.connect(self.main_window.on_listening_started)
         self.speech_module.listening_ended.connect(self.main_window.on_listening_ended)
 
@@ -119,149 +208,169 @@ class AIAssistantApp:
 
     def process_command(self, text):
         """Process a command or query from the user"""
-        # Guard against empty or None text
-        if not text:
+        # Strip and lowercase once for all the checks below
+        text_clean = text.strip() if text else ""
+        text_lower = text_clean.lower()
+        
+        # Guard against empty, too short, or filler-only text before doing any work
+        if len(text_clean) < 2 or text_lower in _NOISE_WORDS:
             self.handle_assistant_response("I didn't catch that. Could you please speak again?")
             return
             
+        tokens = _tokenize(text_lower)
+        
+        # One clock read shared by the history entry and any time/date reply
+        now = QDateTime.currentDateTime()
+        
+        # Check for specific command types
+        command_intent = self.get_command_intent(text_lower, tokens)
+        
         # Add user message to the conversation
-        self.main_window.add_user_message(text)
+        self.main_window.add_user_message(text_clean)
         
         # Track this command in history
-        self.add_to_command_history(text)
+        self.add_to_command_history(text_clean, command_intent, now)
         
         # First check for direct system commands
-        if self.process_system_command(text):
+        if self.process_system_command(text_lower, tokens, now):
             return
             
-        # Check for specific command types
-        command_intent = self.get_command_intent(text)
-        
         # Update intent frequency
         self.update_intent_frequency(command_intent)
         
         # Process based on intent
         if command_intent == "weather":
-            self.process_weather_command(text)
+            self.process_weather_command(text_clean)
             
         elif command_intent == "news":
-            self.process_news_command(text)
+            self.process_news_command(text_clean, tokens)
             
         elif command_intent == "reminder":
-            self.process_reminder_command(text)
+            self.process_reminder_command(text_clean)
             
         else:
             # Use AI module for general queries
-            self.ai_module.process_query(text, self.handle_ai_response)
+            # Speak the answer sentence by sentence while it is still being generated
+            self.ai_module.process_query(
+                text_clean, self._invoker.wrap(self.handle_ai_response), on_sentence=self.tts_module.speak
+            )
             
-    def get_command_intent(self, text):
-        """Determine the intent of a command"""
-        text_lower = text.lower()
-        
-        if any(word in text_lower for word in ["weather", "temperature", "forecast"]):
+    def get_command_intent(self, text_lower, tokens):
+        """Determine the intent of a lowercased, tokenized command"""
+        if tokens & _WEATHER_KW:
             return "weather"
             
-        elif any(word in text_lower for word in ["news", "headlines", "latest"]):
+        elif tokens & _NEWS_KW:
             return "news"
             
-        elif any(word in text_lower for word in ["remind", "reminder", "schedule"]):
+        elif tokens & _REMINDER_KW:
             return "reminder"
             
-        elif any(word in text_lower for word in ["time", "date", "day"]):
+        elif tokens & _TIME_KW:
             return "time"
             
-        elif any(word in text_lower for word in ["help", "command", "what can you do"]):
+        elif tokens & _HELP_KW or any(phrase in text_lower for phrase in _HELP_PHRASES):
             return "help"
             
         return "general"
         
-    def process_system_command(self, text):
+    def process_system_command(self, text_lower, tokens, now):
         """Process system commands like exit, shutdown, etc."""
-        text_lower = text.lower()
-        
-        # Check for command prefixes
-        command_prefixes = ["computer", "assistant", "hey assistant", "execute", "run"]
-        is_direct_command = any(text_lower.startswith(prefix) for prefix in command_prefixes)
-        
-        # If it's a direct command, strip the prefix
-        if is_direct_command:
-            for prefix in command_prefixes:
-                if text_lower.startswith(prefix):
-                    # Remove prefix and trim whitespace
-                    command_text = text_lower[len(prefix):].strip()
-                    return self.execute_direct_command(command_text)
+        # Find the command prefix, if any, in a single pass
+        prefix = next((p for p in _CMD_PREFIXES if text_lower.startswith(p)), None)
+        if prefix is not None:
+            # Remove prefix and trim whitespace
+            command_text = text_lower[len(prefix):].strip()
+            return self.execute_direct_command(command_text, now)
         
         # Exit commands
-        if any(cmd in text_lower for cmd in ["exit", "quit", "close", "shutdown"]):
+        if tokens & _EXIT_KW:
             self.handle_assistant_response("Shutting down. Goodbye!")
             QTimer.singleShot(2000, self.app.quit)
             return True
             
         # Help command
-        elif any(cmd in text_lower for cmd in ["help", "what can you do", "commands"]):
+        elif tokens & _HELP_KW or any(phrase in text_lower for phrase in _HELP_PHRASES):
             self.show_help()
             return True
             
         # History command
-        elif any(cmd in text_lower for cmd in ["history", "previous commands", "what did i say"]):
+        elif tokens & _HISTORY_KW or any(phrase in text_lower for phrase in _HISTORY_PHRASES):
             self.show_command_history()
             return True
             
         return False
         
-    def execute_direct_command(self, command_text):
-        """Execute a direct command from the user"""
-        # Simple command mapping
-        if command_text in ["time", "current time", "what time is it"]:
-            current_time = QDateTime.currentDateTime().toString("hh:mm AP")
-            self.handle_assistant_response(f"The current time is {current_time}")
-            return True
-            
-        elif command_text in ["date", "today", "what day is it", "current date"]:
-            current_date = QDateTime.currentDateTime().toString("dddd, MMMM d, yyyy")
-            self.handle_assistant_response(f"Today is {current_date}")
-            return True
-            
-        elif command_text in ["repeat", "repeat last", "say that again"]:
-            if self.command_history and len(self.command_history) > 1:
-                last_command = self.command_history[-2]["command"]
-                self.handle_assistant_response(f"Your last command was: {last_command}")
-            else:
-                self.handle_assistant_response("You haven't made any previous commands.")
-            return True
-            
-        elif command_text in ["start listening", "listen"]:
-            self.speech_module.start_listening()
-            self.handle_assistant_response("I'm listening now.")
-            return True
-            
-        elif command_text in ["stop listening", "stop"]:
-            self.speech_module.stop_listening()
-            self.handle_assistant_response("I've stopped listening.")
-            return True
-            
+    def say_time(self, now):
+        """Tell the user the current time"""
+        current_time = now.toString(_TIME_FMT)
+        self.handle_assistant_response(f"The current time is {current_time}")
+        return True
+        
+    def say_date(self, now):
+        """Tell the user the current date"""
+        current_date = now.toString(_DATE_FMT)
+        self.handle_assistant_response(f"Today is {current_date}")
+        return True
+        
+    def repeat_last_command(self, now):
+        """Tell the user their previous command"""
+        if self.command_history and len(self.command_history) > 1:
+            last_command = self.command_history[-2]["command"]
+            self.handle_assistant_response(f"Your last command was: {last_command}")
+        else:
+            self.handle_assistant_response("You haven't made any previous commands.")
+        return True
+        
+    def start_listening_command(self, now):
+        """Start listening on request"""
+        self.speech_module.start_listening()
+        self.handle_assistant_response("I'm listening now.")
+        return True
+        
+    def stop_listening_command(self, now):
+        """Stop listening on request"""
+        self.speech_module.stop_listening()
+        self.handle_assistant_response("I've stopped listening.")
+        return True
+        
+    # Direct command phrases mapped to their handlers
+    DIRECT_COMMANDS = {
+        "time": say_time,
+        "current time": say_time,
+        "what time is it": say_time,
+        "date": say_date,
+        "today": say_date,
+        "what day is it": say_date,
+        "current date": say_date,
+        "repeat": repeat_last_command,
+        "repeat last": repeat_last_command,
+        "say that again": repeat_last_command,
+        "start listening": start_listening_command,
+        "listen": start_listening_command,
+        "stop listening": stop_listening_command,
+        "stop": stop_listening_command,
+    }
+        
+    def execute_direct_command(self, command_text, now):
+        """Execute a direct command from the user; handlers receive the command's QDateTime"""
+        handler = self.DIRECT_COMMANDS.get(command_text)
+        
         # Try to process as a general command if no direct match
-        return False
+        return handler(self, now) if handler else False
         
-    def add_to_command_history(self, command):
-        """Add a command to the history"""
-        timestamp = QDateTime.currentDateTime().toString("yyyy-MM-dd hh:mm:ss")
+    def add_to_command_history(self, command, intent, now):
+        """Add a command and its already-detected intent to the history"""
+        timestamp = now.toString(_TS_FMT)
         self.command_history.append({
             "command": command,
             "timestamp": timestamp,
-            "intent": self.get_command_intent(command)
+            "intent": intent
         })
-        
-        # Limit history size
-        if len(self.command_history) > self.max_history_size:
-            self.command_history.pop(0)
             
     def update_intent_frequency(self, intent):
         """Update the frequency counter for intents"""
-        if intent in self.recent_intents:
-            self.recent_intents[intent] += 1
-        else:
-            self.recent_intents[intent] = 1
+        self.recent_intents[intent] += 1
             
     def show_help(self):
         """Show available commands"""
@@ -282,13 +391,14 @@ class AIAssistantApp:
             self.handle_assistant_response("You haven't given me any commands yet.")
             return
             
-        # Show the last 5 commands
-        num_to_show = min(5, len(self.command_history))
-        history_items = self.command_history[-num_to_show:]
+        # Show the last 5 commands, newest first
+        history_items = islice(reversed(self.command_history), 5)
         
-        response = "Here are your recent commands:\n"
-        for i, item in enumerate(reversed(history_items), 1):
-            response += f"{i}. {item['command']} ({item['timestamp']})\n"
+        lines = [
+            f"{i}. {item['command']} ({item['timestamp']})"
+            for i, item in enumerate(history_items, 1)
+        ]
+        response = "Here are your recent commands:\n" + "\n".join(lines)
             
         self.handle_assistant_response(response)
 
@@ -296,20 +406,20 @@ class AIAssistantApp:
         """Process a weather-related command"""
         # Extract location from the command if specified, otherwise use default
         location = self.config.get("default_location", "Lucknow")
-        self.weather_module.get_weather(location, self.handle_weather_response)
+        self.weather_module.get_weather(location, self._invoker.wrap(self.handle_weather_response))
 
-    def process_news_command(self, text):
+    def process_news_command(self, text, tokens):
         """Process a news-related command"""
         # Extract category from the command if specified, otherwise use top headlines
         category = "general"
-        if "technology" in text.lower() or "tech" in text.lower():
+        if "technology" in tokens or "tech" in tokens:
             category = "technology"
-        elif "sports" in text.lower():
+        elif "sports" in tokens:
             category = "sports"
-        elif "business" in text.lower():
+        elif "business" in tokens:
             category = "business"
 
-        self.news_module.get_news(category, self.handle_news_response)
+        self.news_module.get_news(category, self._invoker.wrap(self.handle_news_response))
 
     def process_reminder_command(self, text):
         """Process a reminder-related command"""
@@ -333,9 +443,9 @@ class AIAssistantApp:
         if news_info["success"]:
             news_items = news_info["articles"][:3]  # Get top 3 articles
 
-            response = "Here are the latest headlines: "
-            for i, article in enumerate(news_items, 1):
-                response += f"{i}. {article['title']}. "
+            response = "Here are the latest headlines: " + " ".join(
+                f"{i}. {article.title}." for i, article in enumerate(news_items, 1)
+            )
         else:
             response = "Sorry, I couldn't get the latest news. Please try again later."
 
@@ -343,6 +453,11 @@ class AIAssistantApp:
 
     def handle_ai_response(self, response_info):
         """Handle the response from the AI module"""
+        if response_info.get("streamed"):
+            # Already spoken while streaming; only show it
+            self.main_window.add_assistant_message(response_info["response"])
+            return
+
         if response_info["success"]:
             response = response_info["response"]
         else:
@@ -352,11 +467,10 @@ class AIAssistantApp:
 
     def handle_assistant_response(self, response):
         """Process and display the assistant's response"""
-        # Add assistant message to the conversation UI
-        self.main_window.add_assistant_message(response)
-
-        # Speak the response
-        self.tts_module.speak(response)
+        # Queue the UI update and speech as separate event-loop calls so the text is
+        # painted before TTS dispatch gets a chance to block
+        QTimer.singleShot(0, lambda: self.main_window.add_assistant_message(response))
+        QTimer.singleShot(0, lambda: self.tts_module.speak(response))
 
     def enable_listening(self):
         """Enable listening mode and start recognition."""
@@ -376,8 +490,15 @@ class AIAssistantApp:
     def handle_close_event(self, event):
         """Handle application close event"""
         # Shut down all modules properly
-        self.speech_module.stop_listening()
+        self.speech_module.shutdown()
         self.tts_module.shutdown()
+
+        # Close the HTTP sessions of the network modules that were built successfully
+        for name in ("news", "weather"):
+            future = self._module_futures[name]
+            if future.done() and future.exception() is None:
+                future.result().close()
+        self._request_pool.shutdown(wait=False)
         event.accept()
         
     def run(self):
@@ -390,9 +511,12 @@ class AIAssistantApp:
             greeting = "Hello! I'm your AI desktop assistant. How can I help you today?"
             self.main_window.add_assistant_message(greeting)
             self.tts_module.speak(greeting)
-        
-        # Automatically start listening after the greeting
-        self.enable_listening()
+
+            # Start listening once the greeting has been spoken (resume_listening_after_tts),
+            # so the first microphone calibration doesn't measure the assistant's own voice
+            self.is_listening_enabled = True
+        else:
+            self.enable_listening()
 
         # Execute the application
         return self.app.exec_()
@@ -3,7 +3,11 @@ AI Desktop Assistant - AI Module
 Handles AI functionality and natural language processing.
 """
 
+import functools
 import os
+import random
+import re
+from concurrent.futures import ThreadPoolExecutor
 
 # Handle openai import conditionally
 try:
@@ -13,18 +17,167 @@ except ImportError:
     OPENAI_AVAILABLE = False
     print("OpenAI package not installed. Using fallback responses.")
 
+# Matches the word following a standalone "in", e.g. "weather in London"
+_LOC_RE = re.compile(r'\bin\s+([A-Za-z][A-Za-z\-]*)', re.I)
+
+# Sentence terminators that are followed by whitespace, so "3.5" is never split
+_SENTENCE_END_RE = re.compile(r'[.!?](?=\s)')
+
+# Words whose trailing period rarely ends a sentence
+_ABBREVIATIONS = frozenset(('mr', 'mrs', 'ms', 'dr', 'prof', 'sr', 'jr', 'st', 'vs', 'etc'))
+
+def _last_sentence_end(text):
+    """
+    Find where the last complete sentence in a piece of text ends.
+    
+    Args:
+        text (str): Text received so far
+        
+    Returns:
+        int: Index just past the last sentence terminator, or -1 if there is none
+    """
+    for match in reversed(list(_SENTENCE_END_RE.finditer(text))):
+        if match.group() == '.':
+            words = text[:match.start()].split()
+            word = words[-1] if words else ''
+            # Skip "Dr.", "etc.", initials such as "J." and dotted abbreviations such as "U.S."
+            if word.lower() in _ABBREVIATIONS or '.' in word or (len(word) == 1 and word.isupper()):
+                continue
+        return match.end()
+    return -1
+
+# Responses used when the AI service is unavailable
+_FALLBACK_RESPONSES = (
+    "I'm sorry, I can't access my AI services right now.",
+    "I'm having trouble connecting to my knowledge base at the moment.",
+    "I apologize, but I'm unable to process that request right now.",
+    "My advanced AI capabilities are currently unavailable. Can I help with something basic instead?"
+)
+
+class KeywordProcessor:
+    """
+    Single-pass keyword matcher in the style of FlashText.
+    
+    Keywords are stored in a character trie and only matched on whole words,
+    so a sentence is scanned once however many keywords are registered.
+    """
+    
+    # Marks the end of a keyword in the trie; can't collide with single characters
+    _END = "_end_"
+    
+    def __init__(self, case_sensitive=False):
+        """
+        Initialize an empty keyword trie.
+        
+        Args:
+            case_sensitive (bool): Whether keywords must match case exactly
+        """
+        self.case_sensitive = case_sensitive
+        self._trie = {}
+    
+    def add_keyword(self, keyword, clean_name):
+        """
+        Register a keyword.
+        
+        Args:
+            keyword (str): Word to look for
+            clean_name (str): Value reported when the keyword is found
+        """
+        if not self.case_sensitive:
+            keyword = keyword.lower()
+            
+        node = self._trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[self._END] = clean_name
+    
+    def extract_keywords(self, sentence):
+        """
+        Find all registered keywords in a sentence.
+        
+        Args:
+            sentence (str): Input text
+            
+        Returns:
+            list: Clean names of the keywords found, in order of appearance
+        """
+        if not self.case_sensitive:
+            sentence = sentence.lower()
+            
+        found = []
+        length = len(sentence)
+        idx = 0
+        while idx < length:
+            # Move to the start of the next word
+            while idx < length and not sentence[idx].isalnum():
+                idx += 1
+                
+            # Walk the trie, remembering the longest keyword ending on a word boundary
+            node = self._trie
+            match = None
+            end = pos = idx
+            while pos < length and sentence[pos] in node:
+                node = node[sentence[pos]]
+                pos += 1
+                if self._END in node and (pos == length or not sentence[pos].isalnum()):
+                    match = node[self._END]
+                    end = pos
+                    
+            if match is not None:
+                found.append(match)
+                idx = end
+                
+            # Skip the rest of the current word
+            while idx < length and sentence[idx].isalnum():
+                idx += 1
+                
+        return found
+
+# Words that signal each intent
+_INTENT_WORDS = {
+    'weather': frozenset(('weather', 'temperature', 'forecast')),
+    'news': frozenset(('news', 'headlines', 'articles')),
+    'time': frozenset(('time', 'date', 'day'))
+}
+
+# NewsAPI categories recognised in news commands
+_NEWS_CATEGORIES = frozenset(('business', 'entertainment', 'general', 'health',
+                              'science', 'sports', 'technology'))
+
+def _build_keyword_processor():
+    """
+    Build the keyword trie for intent and news category detection.
+    
+    Returns:
+        KeywordProcessor: Processor reporting intents by name and categories as 'cat:<name>'
+    """
+    processor = KeywordProcessor(case_sensitive=False)
+    for intent, words in _INTENT_WORDS.items():
+        for word in words:
+            processor.add_keyword(word, intent)
+    for category in _NEWS_CATEGORIES:
+        processor.add_keyword(category, 'cat:' + category)
+    return processor
+
 class AIModule:
     """Handles AI functionality using OpenAI's GPT models."""
     
-    def __init__(self, config=None, api_key=None):
+    # Keyword trie shared by all instances; it is only read after construction
+    _kw = _build_keyword_processor()
+    
+    def __init__(self, config=None, api_key=None, executor=None):
         """
         Initialize the AI module.
         
         Args:
             config (AppConfig, optional): Application configuration object
             api_key (str, optional): OpenAI API key. If not provided, will try to get from environment.
+            executor (Executor, optional): Runs process_query requests that have a callback.
+                A private pool is created if not provided.
         """
         self.config = config
+        self._pool = executor or ThreadPoolExecutor(max_workers=4)
+        
         # Use provided API key or get from environment
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
         
@@ -37,41 +190,91 @@ class AIModule:
             if not self.api_key:
                 print("Warning: No OpenAI API key provided. AI functionality will be limited.")
     
-    def generate_response(self, prompt, max_tokens=150):
+    def generate_response(self, prompt, max_tokens=150, on_sentence=None):
         """
         Generate a response to a prompt using OpenAI API.
         
+        The completion is streamed, so callers can start using the first
+        sentences while the rest is still being generated.
+        
         Args:
             prompt (str): The user's input prompt
             max_tokens (int): Maximum number of tokens to generate
+            on_sentence (function, optional): Called with each complete sentence as it
+                arrives. All of the returned text, fallbacks included, is passed to it.
             
         Returns:
             str: Generated response or error message
         """
         if not OPENAI_AVAILABLE or not self.api_key:
-            return self._get_fallback_response(prompt)
+            return self._deliver(self._get_fallback_response(prompt), on_sentence)
             
+        # Sentences already handed to on_sentence, e.g. spoken, before any failure
+        delivered = []
+        
         try:
             # Use the OpenAI ChatCompletions API
-            response = openai.chat.completions.create(
+            stream = openai.chat.completions.create(
                 model="gpt-4o-mini",  # Using the model specified in the curl example
                 messages=[
                     {"role": "user", "content": prompt}
                 ],
                 max_tokens=max_tokens,
                 temperature=0.7,  # Add some creative variation
-                store=True  # As specified in the curl example
+                store=True,  # As specified in the curl example
+                stream=True
             )
             
-            # Extract the response content
-            if response.choices and len(response.choices) > 0:
-                return response.choices[0].message.content
+            # Collect the streamed content, handing off each finished sentence
+            parts = []
+            pending = ""
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content or ""
+                if not delta:
+                    continue
+                parts.append(delta)
+                
+                if on_sentence:
+                    pending += delta
+                    end = _last_sentence_end(pending)
+                    if end > 0:
+                        sentence = pending[:end].strip()
+                        on_sentence(sentence)
+                        delivered.append(sentence)
+                        pending = pending[end:]
+                        
+            if on_sentence and pending.strip():
+                on_sentence(pending.strip())
+                
+            if parts:
+                return "".join(parts)
             else:
-                return "I'm not sure how to respond to that."
+                return self._deliver("I'm not sure how to respond to that.", on_sentence)
                 
         except Exception as e:
             print(f"Error in OpenAI API call: {e}")
-            return self._get_fallback_response(prompt)
+            # Part of the answer was already delivered; return just that, matching what was
+            # spoken, rather than following it with an apology
+            if delivered:
+                return " ".join(delivered)
+            return self._deliver(self._get_fallback_response(prompt), on_sentence)
+    
+    def _deliver(self, text, on_sentence):
+        """
+        Pass a complete, non-streamed response to the sentence callback.
+        
+        Args:
+            text (str): Response text
+            on_sentence (function): Sentence callback or None
+            
+        Returns:
+            str: The same text
+        """
+        if on_sentence:
+            on_sentence(text)
+        return text
     
     def process_command(self, command):
         """
@@ -83,26 +286,32 @@ class AIModule:
         Returns:
             dict: Command intent and parameters
         """
-        # Simple rule-based intent recognition
-        command = command.lower()
+        # Simple rule-based intent recognition from a single keyword scan;
+        # matching is case-insensitive, so the command keeps its original case
+        hits = self._kw.extract_keywords(command)
+        categories = [hit[4:] for hit in hits if hit.startswith('cat:')]
         
-        if any(word in command for word in ['weather', 'temperature', 'forecast']):
+        if 'weather' in hits:
             return {'intent': 'weather', 'params': {'location': self._extract_location(command)}}
             
-        elif any(word in command for word in ['news', 'headlines', 'articles']):
-            return {'intent': 'news', 'params': {'category': self._extract_category(command)}}
+        elif 'news' in hits:
+            return {'intent': 'news', 'params': {'category': categories[0] if categories else None}}
             
-        elif any(word in command for word in ['time', 'date', 'day']):
+        elif 'time' in hits:
             return {'intent': 'time', 'params': {}}
             
         # Add more intents as needed
             
         return {'intent': 'general', 'params': {'query': command}}
     
-    def _extract_location(self, text):
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _extract_location(text):
         """
         Extract location from text using simple heuristics.
         
+        Results are memoized, since repeated commands are common.
+        
         Args:
             text (str): Input text
             
@@ -113,32 +322,8 @@ class AIModule:
         # In a real app, you'd use NLP techniques like NER
         
         # Check for "in [location]" pattern
-        if 'in ' in text:
-            parts = text.split('in ')
-            if len(parts) > 1:
-                location = parts[1].strip().split(' ')[0]
-                return location
-                
-        return None
-    
-    def _extract_category(self, text):
-        """
-        Extract news category from text.
-        
-        Args:
-            text (str): Input text
-            
-        Returns:
-            str: Extracted category or None
-        """
-        categories = ['business', 'entertainment', 'general', 'health', 
-                      'science', 'sports', 'technology']
-                      
-        for category in categories:
-            if category in text.lower():
-                return category
-                
-        return None
+        match = _LOC_RE.search(text)
+        return match.group(1) if match else None
     
     def _get_fallback_response(self, prompt):
         """
@@ -150,23 +335,38 @@ class AIModule:
         Returns:
             str: Fallback response
         """
-        fallback_responses = [
-            "I'm sorry, I can't access my AI services right now.",
-            "I'm having trouble connecting to my knowledge base at the moment.",
-            "I apologize, but I'm unable to process that request right now.",
-            "My advanced AI capabilities are currently unavailable. Can I help with something basic instead?"
-        ]
-        
-        import random
-        return random.choice(fallback_responses)
+        return random.choice(_FALLBACK_RESPONSES)
         
-    def process_query(self, query, callback=None):
+    def process_query(self, query, callback=None, on_sentence=None):
         """
         Process a general query and return an answer.
         
+        With a callback the query runs on the module's executor, and both callbacks
+        are called from that worker thread.
+        
+        Args:
+            query (str): The user's query
+            callback (function): Optional callback function to handle the response
+            on_sentence (function): Optional callback receiving the answer sentence by
+                sentence as it is generated, e.g. to start speaking early
+            
+        Returns:
+            dict: Response information dictionary, or a Future for it if a callback
+                was given. "streamed" is True when the whole answer was already passed
+                to on_sentence.
+        """
+        if callback:
+            return self._pool.submit(self._process_query_sync, query, callback, on_sentence)
+        return self._process_query_sync(query, on_sentence=on_sentence)
+    
+    def _process_query_sync(self, query, callback=None, on_sentence=None):
+        """
+        Answer a general query on the calling thread.
+        
         Args:
             query (str): The user's query
             callback (function): Optional callback function to handle the response
+            on_sentence (function): Optional sentence callback, see process_query
             
         Returns:
             dict: Response information dictionary
@@ -174,16 +374,16 @@ class AIModule:
         try:
             # Process the query and generate a response
             if self.api_key:
-                # For now, use a simple fallback since OpenAI integration is commented out
-                response = self.generate_response(query)
+                response = self.generate_response(query, on_sentence=on_sentence)
             else:
-                response = self._get_fallback_response(query)
+                response = self._deliver(self._get_fallback_response(query), on_sentence)
                 
             # Create response dictionary
             response_info = {
                 "success": True,
                 "query": query,
-                "response": response
+                "response": response,
+                "streamed": on_sentence is not None
             }
             
             # Call the callback if provided
@@ -200,7 +400,8 @@ class AIModule:
                 "success": False,
                 "query": query,
                 "error": str(e),
-                "response": "I encountered an error processing your request."
+                "response": "I encountered an error processing your request.",
+                "streamed": False
             }
             
             # Call the callback if provided
@@ -3,29 +3,108 @@ AI Desktop Assistant - News Module
 Fetches and processes news from various sources.
 """
 
+import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Parse responses with orjson when available; NewsAPI article lists are large
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# The article fields the assistant uses; source is the source name
+Article = namedtuple('Article', 'title source description published url')
+
+# Placeholder articles used when the API is unavailable; published is filled in per call
+_DUMMY_ARTICLES_TEMPLATE = (
+    Article(
+        title='Sample News Headline 1',
+        source='Sample News Source',
+        description='This is a placeholder news article description.',
+        published='',
+        url='https://example.com/news/1'
+    ),
+    Article(
+        title='Sample News Headline 2',
+        source='Sample News Source',
+        description='Another placeholder news article for demonstration.',
+        published='',
+        url='https://example.com/news/2'
+    )
+)
+
+def _to_articles(raw_articles):
+    """
+    Reduce NewsAPI article dictionaries to Article tuples.
+    
+    Args:
+        raw_articles (list): Article dictionaries from a NewsAPI response
+        
+    Returns:
+        list: List of Article tuples
+    """
+    return [
+        Article(
+            a.get('title') or 'Untitled',
+            (a.get('source') or {}).get('name') or 'Unknown source',
+            a.get('description') or '',
+            a.get('publishedAt') or '',
+            a.get('url') or ''
+        )
+        for a in raw_articles
+    ]
+
 class NewsModule:
     """Handles fetching and processing of news content."""
     
-    def __init__(self, config=None, api_key=None):
+    def __init__(self, config=None, api_key=None, executor=None):
         """
         Initialize the news module.
         
         Args:
             config (AppConfig, optional): Application configuration object
             api_key (str, optional): NewsAPI key. If not provided, will try to get from environment.
+            executor (Executor, optional): Runs get_news requests that have a callback.
+                A private pool is created if not provided.
         """
         self.config = config
+        self._owns_pool = executor is None
+        self._pool = executor or ThreadPoolExecutor(max_workers=4)
         # Use provided API key or get from environment
         self.api_key = api_key or os.getenv('NEWS_API_KEY')
         self.base_url = "https://newsapi.org/v2"
+        self._top_url = f"{self.base_url}/top-headlines"
+        self._search_url = f"{self.base_url}/everything"
+        
+        # Persistent session so requests reuse pooled keep-alive connections
+        self._http = requests.Session()
+        self._http.mount("https://", HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=4,
+            max_retries=Retry(total=2, backoff_factor=0.2)
+        ))
+        self._http.headers.update({'Accept-Encoding': 'gzip'})
+        
+        # Recent article lists, keyed by request parameters
+        self._news_cache = TTLCache(maxsize=128, ttl=120)
+        
+        # Last ETag and articles per headline request, for conditional re-fetches
+        self._etags = {}
         
         if not self.api_key:
-            print("Warning: No NewsAPI key provided. News functionality will be limited.")
+            logger.warning("No NewsAPI key provided. News functionality will be limited.")
     
     def get_headlines(self, country="us", category=None, count=5):
         """
@@ -37,14 +116,14 @@ class NewsModule:
             count (int): Number of headlines to fetch
             
         Returns:
-            list: List of news article dictionaries or empty list if failed
+            list: List of Article tuples, or dummy articles if failed
         """
         if not self.api_key:
-            print("Error: No NewsAPI key available.")
+            logger.error("No NewsAPI key available.")
             return self._get_dummy_headlines()
             
         try:
-            url = f"{self.base_url}/top-headlines"
+            url = self._top_url
             params = {
                 'country': country,
                 'pageSize': count,
@@ -54,14 +133,37 @@ class NewsModule:
             if category:
                 params['category'] = category
                 
-            response = requests.get(url, params=params)
-            response.raise_for_status()
+            cache_key = ('top-headlines', country, category, count)
+            cached = self._news_cache.get(cache_key)
+            if cached is not None:
+                return cached
+                
+            # Revalidate previously fetched headlines instead of downloading them again
+            headers = {}
+            etag_entry = self._etags.get(cache_key)
+            if etag_entry:
+                headers['If-None-Match'] = etag_entry[0]
+                
+            response = self._http.get(url, params=params, headers=headers, timeout=(2, 5))
             
-            data = response.json()
-            return data.get('articles', [])
+            if response.status_code == 304 and etag_entry:
+                articles = etag_entry[1]
+            else:
+                if response.status_code >= 400:
+                    logger.warning("News request failed with HTTP %s", response.status_code)
+                    return self._get_dummy_headlines()
+                    
+                data = _loads(response.content)
+                articles = _to_articles(data.get('articles', []))
+                etag = response.headers.get('ETag')
+                if etag:
+                    self._etags[cache_key] = (etag, articles)
+                    
+            self._news_cache.set(cache_key, articles)
+            return articles
             
-        except Exception as e:
-            print(f"Error fetching news: {e}")
+        except (requests.RequestException, ValueError) as e:
+            logger.error("Error fetching news: %s", e)
             return self._get_dummy_headlines()
     
     def search_news(self, query, count=5, sort_by="relevancy"):
@@ -74,61 +176,64 @@ class NewsModule:
             sort_by (str): Sort order (relevancy, popularity, publishedAt)
             
         Returns:
-            list: List of news article dictionaries or empty list if failed
+            list: List of Article tuples, or dummy articles if failed
         """
         if not self.api_key:
-            print("Error: No NewsAPI key available.")
+            logger.error("No NewsAPI key available.")
             return self._get_dummy_headlines()
             
         try:
-            url = f"{self.base_url}/everything"
+            url = self._search_url
             params = {
                 'q': query,
                 'pageSize': count,
                 'sortBy': sort_by,
                 'apiKey': self.api_key
             }
+            
+            cache_key = ('everything', query, count, sort_by)
+            cached = self._news_cache.get(cache_key)
+            if cached is not None:
+                return cached
                 
-            response = requests.get(url, params=params)
-            response.raise_for_status()
+            response = self._http.get(url, params=params, timeout=(2, 5))
+            if response.status_code >= 400:
+                logger.warning("News search failed with HTTP %s", response.status_code)
+                return self._get_dummy_headlines()
             
-            data = response.json()
-            return data.get('articles', [])
+            data = _loads(response.content)
+            articles = _to_articles(data.get('articles', []))
+            self._news_cache.set(cache_key, articles)
+            return articles
             
-        except Exception as e:
-            print(f"Error searching news: {e}")
+        except (requests.RequestException, ValueError) as e:
+            logger.error("Error searching news: %s", e)
             return self._get_dummy_headlines()
     
+    def close(self):
+        """
+        Close the HTTP session and its pooled connections.
+        """
+        if self._owns_pool:
+            self._pool.shutdown(wait=False)
+        self._http.close()
+    
     def _get_dummy_headlines(self):
         """
         Get dummy headlines when API is unavailable.
         
         Returns:
-            list: List of dummy news article dictionaries
-        """
-        return [
-            {
-                'title': 'Sample News Headline 1',
-                'description': 'This is a placeholder news article description.',
-                'url': 'https://example.com/news/1',
-                'publishedAt': datetime.now().isoformat(),
-                'source': {'name': 'Sample News Source'}
-            },
-            {
-                'title': 'Sample News Headline 2',
-                'description': 'Another placeholder news article for demonstration.',
-                'url': 'https://example.com/news/2',
-                'publishedAt': datetime.now().isoformat(),
-                'source': {'name': 'Sample News Source'}
-            }
-        ]
+            list: List of dummy Article tuples
+        """
+        now = datetime.now().isoformat()
+        return [article._replace(published=now) for article in _DUMMY_ARTICLES_TEMPLATE]
     
     def format_articles_for_speech(self, articles, include_description=False):
         """
         Format articles for speech output.
         
         Args:
-            articles (list): List of news article dictionaries
+            articles (list): List of Article tuples
             include_description (bool): Whether to include article descriptions
             
         Returns:
@@ -137,20 +242,38 @@ class NewsModule:
         if not articles:
             return "I couldn't find any news articles at the moment."
             
-        result = "Here are the top headlines: "
+        parts = ["Here are the top headlines: "]
         
         for i, article in enumerate(articles, 1):
-            result += f"{i}. {article.get('title', 'Untitled')} from {article.get('source', {}).get('name', 'Unknown source')}. "
+            parts.append(f"{i}. {article.title} from {article.source}. ")
             
-            if include_description and article.get('description'):
-                result += f"{article.get('description')} "
+            if include_description and article.description:
+                parts.append(f"{article.description} ")
                 
-        return result
+        return "".join(parts)
         
     def get_news(self, category="general", callback=None):
         """
         Get top news headlines and process them using a callback.
         
+        With a callback the request runs on the module's executor and the callback
+        is called from that worker thread.
+        
+        Args:
+            category (str): News category (business, entertainment, general, etc.)
+            callback (function): Optional callback function to handle the response
+            
+        Returns:
+            dict: News information dictionary, or a Future for it if a callback was given
+        """
+        if callback:
+            return self._pool.submit(self._get_news_sync, category, callback)
+        return self._get_news_sync(category)
+    
+    def _get_news_sync(self, category="general", callback=None):
+        """
+        Fetch top news headlines on the calling thread.
+        
         Args:
             category (str): News category (business, entertainment, general, etc.)
             callback (function): Optional callback function to handle the response
@@ -186,7 +309,7 @@ class NewsModule:
             return news_info
             
         except Exception as e:
-            print(f"Error getting news: {e}")
+            logger.error("Error getting news: %s", e)
             
             # Create error response
             error_response = {
@@ -3,25 +3,67 @@ AI Desktop Assistant - Speech Recognition Module
 Handles speech-to-text functionality for voice commands.
 """
 
+import logging
 import speech_recognition as sr
-from PyQt5.QtCore import QObject, pyqtSignal, QThread, QTimer
+from speech_recognition.audio import get_flac_converter
+import requests
+from requests.adapters import HTTPAdapter
+from PyQt5.QtCore import QObject, pyqtSignal, QThread
 import threading
+import queue
+import time
+import json
+import os
+import subprocess
+
+logger = logging.getLogger(__name__)
+
+# Handle google-cloud-speech import conditionally
+try:
+    from google.cloud import speech
+    STREAMING_AVAILABLE = True
+except ImportError:
+    STREAMING_AVAILABLE = False
+    logger.info("google-cloud-speech package not installed. Using non-streaming recognition.")
+
+# Seconds between ambient noise recalibrations while listening
+CALIBRATION_INTERVAL = 60
+# Maximum age in seconds of a stored energy threshold reused at startup
+STORED_CALIBRATION_MAX_AGE = 60 * 60
+# Milliseconds shutdown waits for the listening thread; listen() can't be interrupted
+SHUTDOWN_WAIT_MS = 500
+
+# Google Web Speech API endpoint; the key comes from the environment or config
+GOOGLE_SPEECH_URL = "https://www.google.com/speech-api/v2/recognize"
 
 class SpeechRecognitionThread(QThread):
     """Thread class for handling speech recognition in background"""
     
     # Define signals
     text_recognized = pyqtSignal(str)
+    partial_recognized = pyqtSignal(str)
     listening_ended = pyqtSignal()
+    calibrated = pyqtSignal(float)
     
-    def __init__(self, recognizer, microphone, config=None):
+    # Duration of each audio frame pushed to the streaming recognizer
+    FRAME_SECONDS = 0.02
+    
+    def __init__(self, recognizer, source, source_lock, http, config=None, calibration_duration=0,
+                 get_streaming_client=None):
         """Initialize the speech recognition thread"""
         super(SpeechRecognitionThread, self).__init__()
         self.recognizer = recognizer
-        self.microphone = microphone
+        self.source = source
+        self.source_lock = source_lock
+        self.http = http
         self.config = config
+        self.calibration_duration = calibration_duration
+        # Returns the module's shared streaming client, or None if it can't be created
+        self.get_streaming_client = get_streaming_client
         self.is_listening = False
         self.stop_event = threading.Event()
+        # Set once text has been recognized, i.e. a reply is about to be spoken
+        self.recognized = False
         
     def run(self):
         """Main thread execution method"""
@@ -30,11 +72,27 @@ class SpeechRecognitionThread(QThread):
             listen_timeout = 5  # Reduced timeout for more responsive experience
             phrase_timeout = 3  # Time to wait for a phrase to complete
             
-            # Recalibrate for ambient noise each time to adapt to changing environments
-            with self.microphone as source:
-                print("Listening...")
-                # Quick recalibration for current ambient noise
-                self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
+            # The microphone stream is already open; the lock keeps other threads off it
+            with self.source_lock:
+                source = self.source
+                
+                # Periodic recalibration; between these the dynamic energy threshold adapts on its own
+                if self.calibration_duration:
+                    previous_threshold = self.recognizer.energy_threshold
+                    self.recognizer.adjust_for_ambient_noise(source, duration=self.calibration_duration)
+                    
+                    # Stopped mid-calibration, e.g. because speech output started: the sample
+                    # may include the assistant's voice, so neither keep nor store it
+                    if self.stop_event.is_set():
+                        self.recognizer.energy_threshold = previous_threshold
+                        return
+                    self.calibrated.emit(self.recognizer.energy_threshold)
+                    
+                logger.debug("Listening...")
+                
+                # Prefer streaming recognition so audio is uploaded while the user is still talking
+                if self.use_streaming() and self.run_streaming(source, listen_timeout + phrase_timeout):
+                    return
                 
                 try:
                     # Listen with reduced timeout and phrase time limit for better responsiveness
@@ -47,41 +105,219 @@ class SpeechRecognitionThread(QThread):
                     
                     # Check if we've been asked to stop
                     if self.stop_event.is_set():
-                        print("Listening stopped during audio capture")
-                        self.listening_ended.emit()
+                        logger.debug("Listening stopped during audio capture")
                         return
                         
-                    print("Processing speech...")
+                    logger.debug("Processing speech...")
                     # Try recognition with Google
                     try:
-                        text = self.recognizer.recognize_google(audio)
-                        print(f"Recognized: {text}")
+                        text = self.recognize_google(audio)
+                        logger.debug("Recognized: %s", text)
                         
                         # Only emit recognized text if we have text
                         if text and len(text.strip()) > 0:
                             # Emit the signal with text
+                            self.recognized = True
                             self.text_recognized.emit(text)
                     except sr.UnknownValueError:
-                        print("Could not understand audio")
+                        logger.debug("Could not understand audio")
                     except sr.RequestError as e:
-                        print(f"Could not request results from speech recognition service; {e}")
+                        logger.warning("Could not request results from speech recognition service; %s", e)
                 
                 except sr.WaitTimeoutError:
-                    print("No speech detected - waited too long")
+                    logger.debug("No speech detected - waited too long")
                 except Exception as e:
-                    print(f"Error in speech recognition thread: {e}")
+                    logger.error("Error in speech recognition thread: %s", e)
                     
         except Exception as e:
-            print(f"Unexpected error in speech recognition thread: {e}")
+            logger.error("Unexpected error in speech recognition thread: %s", e)
         finally:
             # Always emit the listening ended signal when we're done
             self.listening_ended.emit()
 
+    def recognize_google(self, audio, language="en-US"):
+        """
+        Recognize speech with the Google Web Speech API.
+        
+        Same request as Recognizer.recognize_google, but sent over the module's
+        persistent HTTP session so the TLS connection is reused between utterances.
+        The API key is read from GOOGLE_SPEECH_API_KEY or the speech.google_api_key
+        setting; without one, Recognizer.recognize_google is used with its default key.
+        
+        Args:
+            audio (sr.AudioData): Captured audio
+            language (str): Recognition language code
+            
+        Returns:
+            str: Most likely transcription
+            
+        Raises:
+            sr.RequestError: If the request fails
+            sr.UnknownValueError: If the speech could not be understood
+        """
+        key = os.getenv("GOOGLE_SPEECH_API_KEY")
+        if not key and self.config:
+            key = self.config.get("speech", "google_api_key", None)
+        if not key:
+            return self.recognizer.recognize_google(audio, language=language)
+            
+        sample_rate = max(audio.sample_rate, 8000)
+        flac_data = self.encode_flac(audio, sample_rate)
+        params = {"client": "chromium", "lang": language, "key": key, "pFilter": 0}
+        headers = {"Content-Type": f"audio/x-flac; rate={sample_rate}"}
+        
+        try:
+            response = self.http.post(
+                GOOGLE_SPEECH_URL, params=params, data=flac_data, headers=headers, timeout=(1, 5)
+            )
+            response.raise_for_status()
+        except requests.RequestException as e:
+            raise sr.RequestError(f"recognition request failed; {e}")
+            
+        # The response holds one JSON object per line; the first is usually an empty result
+        for line in response.text.split("\n"):
+            if not line:
+                continue
+            result = json.loads(line).get("result", [])
+            if result and result[0].get("alternative"):
+                return result[0]["alternative"][0]["transcript"]
+                
+        raise sr.UnknownValueError()
+        
+    def encode_flac(self, audio, sample_rate):
+        """
+        Encode audio as FLAC at the fastest compression level.
+        
+        AudioData.get_flac_data always encodes with --best; level 0 sends a somewhat
+        larger payload but spends far less CPU time before the request can start.
+        
+        Args:
+            audio (sr.AudioData): Captured audio
+            sample_rate (int): Sample rate to encode at
+            
+        Returns:
+            bytes: FLAC-encoded audio
+        """
+        wav_data = audio.get_wav_data(convert_rate=sample_rate, convert_width=2)
+        
+        # Keep the encoder from flashing a console window on Windows
+        startup_info = None
+        if os.name == "nt":
+            startup_info = subprocess.STARTUPINFO()
+            startup_info.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            startup_info.wShowWindow = subprocess.SW_HIDE
+            
+        process = subprocess.Popen(
+            [get_flac_converter(), "--stdout", "--totally-silent", "-0", "-"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            startupinfo=startup_info
+        )
+        flac_data, _ = process.communicate(wav_data)
+        return flac_data
+        
+    def use_streaming(self):
+        """Check whether streaming recognition is available and enabled"""
+        if not STREAMING_AVAILABLE or not self.get_streaming_client:
+            return False
+        # Off unless credentials are configured; without them, credential discovery
+        # can block for seconds before failing
+        default = bool(os.getenv("GOOGLE_APPLICATION_CREDENTIALS"))
+        if self.config:
+            return self.config.get("speech", "streaming", default)
+        return default
+        
+    def capture_frames(self, source, frames, max_duration):
+        """
+        Read fixed-size PCM frames from the open microphone into a queue.
+        
+        Args:
+            source: Open microphone source
+            frames (queue.Queue): Queue receiving raw audio frames; None marks the end
+            max_duration (float): Maximum capture time in seconds
+        """
+        frame_size = int(source.SAMPLE_RATE * self.FRAME_SECONDS)
+        deadline = time.monotonic() + max_duration
+        try:
+            while not self.stop_event.is_set() and time.monotonic() < deadline:
+                frames.put(source.stream.read(frame_size))
+        except Exception as e:
+            logger.error("Error capturing audio: %s", e)
+        finally:
+            frames.put(None)
+            
+    def stream_requests(self, frames):
+        """Yield streaming requests from captured frames until capture ends or is cancelled"""
+        while not self.stop_event.is_set():
+            chunk = frames.get()
+            if chunk is None:
+                return
+            yield speech.StreamingRecognizeRequest(audio_content=chunk)
+            
+    def run_streaming(self, source, max_duration):
+        """
+        Recognize speech with Google Cloud streaming recognition.
+        
+        Args:
+            source: Open microphone source
+            max_duration (float): Maximum capture time in seconds
+            
+        Returns:
+            bool: True if the streaming attempt completed, False to fall back to batch recognition
+        """
+        client = self.get_streaming_client()
+        if client is None:
+            return False
+            
+        recognition_config = speech.RecognitionConfig(
+            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+            sample_rate_hertz=source.SAMPLE_RATE,
+            language_code="en-US"
+        )
+        streaming_config = speech.StreamingRecognitionConfig(
+            config=recognition_config,
+            interim_results=True,
+            single_utterance=True
+        )
+        
+        # Capture on a separate thread so audio keeps flowing while responses are read
+        frames = queue.Queue()
+        capture_thread = threading.Thread(
+            target=self.capture_frames,
+            args=(source, frames, max_duration),
+            daemon=True
+        )
+        capture_thread.start()
+        
+        try:
+            responses = client.streaming_recognize(streaming_config, self.stream_requests(frames))
+            for response in responses:
+                for result in response.results:
+                    if not result.alternatives:
+                        continue
+                    transcript = result.alternatives[0].transcript
+                    if result.is_final:
+                        logger.debug("Recognized: %s", transcript)
+                        if transcript.strip():
+                            self.recognized = True
+                            self.text_recognized.emit(transcript)
+                        return True
+                    self.partial_recognized.emit(transcript)
+        except Exception as e:
+            logger.error("Error in streaming recognition: %s", e)
+        finally:
+            # Stop capturing and wait for the capture thread to release the stream
+            self.stop_event.set()
+            capture_thread.join()
+            
+        return True
+
 class SpeechRecognitionModule(QObject):
     """Handles speech recognition functionality."""
     
     # Define signals
     text_recognized = pyqtSignal(str)
+    partial_recognized = pyqtSignal(str)
     listening_started = pyqtSignal()
     listening_ended = pyqtSignal()
     
@@ -96,79 +332,212 @@ class SpeechRecognitionModule(QObject):
         self.recognizer.dynamic_energy_threshold = True  # Dynamically adjust for ambient noise
         self.recognizer.pause_threshold = 0.8  # Shorter pause threshold for quicker response
         
+        # Persistent HTTP session so recognition requests reuse one connection
+        self._http = requests.Session()
+        self._http.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        
+        # Streaming client shared by all listen cycles, created on first use; a failed
+        # creation is remembered so later cycles go straight to batch recognition
+        self._streaming_client = None
+        self._streaming_failed = False
+        self._streaming_lock = threading.Lock()
+        
         # Thread management
         self.speech_thread = None
         self.timeout_count = 0
         self.max_timeouts = 3  # Maximum number of consecutive timeouts before stopping
+        self._stop_requested = False  # Set by stop_listening to suppress auto-restart
+        self._shutting_down = False
+        
+        # Monotonic time of the last ambient noise calibration
+        self._last_calibration_ts = None
+        
+        # Microphone stream kept open across listen cycles
+        self.microphone = None
+        self._source = None
+        self._source_lock = threading.Lock()
         
         # Get default microphone
         try:
             self.microphone = sr.Microphone()
-            # Adjust for ambient noise on startup
-            with self.microphone as source:
-                print("Calibrating microphone for ambient noise...")
-                self.recognizer.adjust_for_ambient_noise(source, duration=2)
-                print("Microphone calibrated.")
+            # Without a recent stored threshold, the first listening thread calibrates,
+            # so the window can appear before the microphone has been sampled
+            self.load_calibration()
         except Exception as e:
-            print(f"Error initializing microphone: {e}")
+            logger.error("Error initializing microphone: %s", e)
             # Will handle microphone errors gracefully during listening
     
+    def open_source(self):
+        """
+        Open the microphone stream if it is not already open.
+        
+        Returns:
+            The open microphone source
+        """
+        with self._source_lock:
+            if self._source is None:
+                self._source = self.microphone.__enter__()
+            return self._source
+    
+    def close_source(self):
+        """Close the persistent microphone stream."""
+        with self._source_lock:
+            if self._source is None:
+                return
+            try:
+                self.microphone.__exit__(None, None, None)
+            except Exception as e:
+                logger.error("Error closing microphone: %s", e)
+            self._source = None
+    
+    def get_streaming_client(self):
+        """
+        Get the shared Google Cloud streaming client, creating it on first call.
+        
+        Returns:
+            speech.SpeechClient: The client, or None if it couldn't be created
+        """
+        with self._streaming_lock:
+            if self._streaming_client is None and not self._streaming_failed:
+                try:
+                    self._streaming_client = speech.SpeechClient()
+                except Exception as e:
+                    logger.warning("Streaming recognition unavailable, falling back: %s", e)
+                    self._streaming_failed = True
+            return self._streaming_client
+    
+    def load_calibration(self):
+        """
+        Restore a recently stored energy threshold from the configuration.
+        
+        Returns:
+            bool: True if a recent threshold was restored
+        """
+        if not self.config:
+            return False
+            
+        threshold = self.config.get("speech", "energy_threshold", None)
+        calibrated_at = self.config.get("speech", "calibrated_at", None)
+        if threshold is None or calibrated_at is None:
+            return False
+        if time.time() - calibrated_at > STORED_CALIBRATION_MAX_AGE:
+            return False
+            
+        self.recognizer.energy_threshold = threshold
+        self._last_calibration_ts = time.monotonic()
+        logger.info("Using stored microphone calibration.")
+        return True
+    
+    def on_calibrated(self, threshold):
+        """Record a completed calibration and store the threshold for the next startup"""
+        self._last_calibration_ts = time.monotonic()
+        if self.config:
+            with self.config.batch():
+                self.config.set("speech", "energy_threshold", threshold)
+                self.config.set("speech", "calibrated_at", time.time())
+    
+    def calibration_due(self):
+        """Check whether the ambient noise calibration is older than the recalibration interval"""
+        if self._last_calibration_ts is None:
+            return True
+        return time.monotonic() - self._last_calibration_ts > CALIBRATION_INTERVAL
+    
     def start_listening(self):
         """
         Start the listening process in a non-blocking way.
         This will be connected to the UI button.
         """
-        # Don't start new thread if one is already running
+        # Re-enable auto-restart and reset its counter
+        self._stop_requested = False
+        self.timeout_count = 0
+        
+        self.start_thread()
+        
+    def start_thread(self):
+        """Create and start a listening thread unless one is already running"""
+        # Don't start new thread if one is already running. If it is still winding down
+        # after stop_listening, on_listening_ended restarts listening once it exits.
         if self.speech_thread and self.speech_thread.isRunning():
-            print("Already listening")
+            logger.debug("Already listening")
             return
             
-        # Reset auto-restart counter
-        self.timeout_count = 0
+        try:
+            source = self.open_source()
+        except Exception as e:
+            logger.error("Error opening microphone: %s", e)
+            self.listening_ended.emit()
+            return
             
         # Emit signal that listening has started
         self.listening_started.emit()
         
-        # Create and start the thread
-        self.speech_thread = SpeechRecognitionThread(self.recognizer, self.microphone, self.config)
+        # Create and start the thread, recalibrating in it only when the last calibration is stale
+        if self._last_calibration_ts is None:
+            calibration_duration = 2  # Full startup calibration
+        elif self.calibration_due():
+            calibration_duration = 0.5
+        else:
+            calibration_duration = 0
+        self.speech_thread = SpeechRecognitionThread(
+            self.recognizer, source, self._source_lock, self._http, self.config, calibration_duration,
+            get_streaming_client=self.get_streaming_client
+        )
         
         # Connect signals
         self.speech_thread.text_recognized.connect(self.on_text_recognized)
+        self.speech_thread.partial_recognized.connect(self.on_partial_recognized)
         self.speech_thread.listening_ended.connect(self.on_listening_ended)
+        self.speech_thread.calibrated.connect(self.on_calibrated)
         
         # Start the thread
         self.speech_thread.start()
         
-        # Enable continuous listening mode with auto-restart
-        QTimer.singleShot(7000, self.check_and_restart_listening)
-        
     def on_text_recognized(self, text):
         """Handle recognized text from the thread"""
+        # Successful recognition resets the consecutive timeout counter
+        self.timeout_count = 0
         self.text_recognized.emit(text)
         
+    def on_partial_recognized(self, text):
+        """Handle an interim transcript from the thread"""
+        self.partial_recognized.emit(text)
+        
     def on_listening_ended(self):
         """Handle the end of listening from the thread"""
         self.listening_ended.emit()
         
+        # Ignore stale threads; the current one emits this as its last action, so waiting is brief
+        thread = self.sender()
+        if thread is not self.speech_thread:
+            return
+        thread.wait()
+        
+        # After a recognized command the reply is spoken and listening resumes once it
+        # finishes; restarting now would record the reply. Only restart after a timeout.
+        if thread.recognized:
+            return
+        self.check_and_restart_listening()
+        
     def check_and_restart_listening(self):
-        """Check if listening has ended due to timeout and possibly restart it"""
-        # Only restart if the thread has ended
-        if not self.speech_thread or not self.speech_thread.isRunning():
-            if self.timeout_count < self.max_timeouts:
-                # Increment timeout counter
-                self.timeout_count += 1
-                print(f"Auto-restarting listening (timeout {self.timeout_count}/{self.max_timeouts})")
-                # Restart listening
-                self.start_listening()
-            else:
-                print(f"Reached maximum consecutive timeouts ({self.max_timeouts}). Stopping auto-restart.")
-                # Reset counter for next manual start
-                self.timeout_count = 0
+        """Restart listening after the thread ends unless listening was stopped"""
+        if self._stop_requested or self._shutting_down:
+            return
+            
+        if self.timeout_count < self.max_timeouts:
+            # Increment timeout counter
+            self.timeout_count += 1
+            logger.debug("Auto-restarting listening (timeout %s/%s)", self.timeout_count, self.max_timeouts)
+            # Restart listening
+            self.start_thread()
+        else:
+            logger.info("Reached maximum consecutive timeouts (%s). Stopping auto-restart.", self.max_timeouts)
+            # Reset counter for next manual start
+            self.timeout_count = 0
         
     def debug_listen(self, test_text):
         """Debug method to simulate speech recognition for testing"""
         self.listening_started.emit()
-        print(f"Debug mode - simulating speech: '{test_text}'")
+        logger.debug("Debug mode - simulating speech: '%s'", test_text)
         
         # Emit recognized text
         self.text_recognized.emit(test_text)
@@ -178,14 +547,28 @@ class SpeechRecognitionModule(QObject):
         """
         Stop the listening process by signaling the listening thread to stop.
         """
+        self._stop_requested = True
+        
         if self.speech_thread and self.speech_thread.isRunning():
-            print("Stopping listening thread")
-            # Set the stop event to signal the thread to exit
+            logger.debug("Stopping listening thread")
+            # Set the stop event to signal the thread to exit; it reports back via listening_ended
             self.speech_thread.stop_event.set()
-            
-            # Wait a moment for the thread to clean up (non-blocking)
-            QThread.msleep(100)
         else:
-            print("No listening thread to stop")
+            logger.debug("No listening thread to stop")
             # Still emit in case UI is out of sync
             self.listening_ended.emit()
+            
+    def shutdown(self):
+        """
+        Stop listening and release the microphone stream.
+        """
+        self._shutting_down = True
+        self.stop_listening()
+        
+        # Don't hold up closing the window for a thread blocked in listen() or a request;
+        # if it is still running it owns the stream, so leave the microphone open
+        if self.speech_thread and not self.speech_thread.wait(SHUTDOWN_WAIT_MS):
+            logger.warning("Listening thread still running at shutdown; not closing the microphone")
+        else:
+            self.close_source()
+        self._http.close()
@@ -3,25 +3,14 @@ AI Desktop Assistant - Text-to-Speech Module
 Handles converting text to spoken audio.
 """
 
+import queue
+import threading
+import time
 import pyttsx3
-from PyQt5.QtCore import QObject, pyqtSignal, QRunnable, QThreadPool
+from PyQt5.QtCore import QObject, pyqtSignal
 
-class SpeakTask(QRunnable):
-    """Runnable task for speaking text to avoid blocking the main thread."""
-    def __init__(self, engine, text):
-        super().__init__()
-        self.engine = engine
-        self.text = text
-
-    def run(self):
-        try:
-            self.engine.say(self.text)
-            self.engine.runAndWait()
-        except RuntimeError:
-            # This can happen if the engine is busy or shutdown.
-            print(f"TTS engine error, could not say: {self.text}")
-        except Exception as e:
-            print(f"Error in speech task: {e}")
+# Milliseconds shutdown waits for the speech worker to stop
+SHUTDOWN_WAIT_MS = 500
 
 class TextToSpeechModule(QObject):
     """
@@ -36,33 +25,112 @@ class TextToSpeechModule(QObject):
         super().__init__()
         self.config = config
         self.engine = pyttsx3.init()
-        self.thread_pool = QThreadPool()
         self.speaking = False
+        
+        # Engine settings as last applied by init_engine
+        self._initialized = False
+        self._rate = None
+        self._volume = None
+        self._voice_id = None
         self.init_engine()
         
+        # Single worker thread that owns the engine and speaks queued text in order
+        self._queue = queue.Queue()
+        self._stop_event = threading.Event()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+        
     def init_engine(self):
         """Initialize or reinitialize the text-to-speech engine."""
-        # Configure properties from config if available
-        rate = self.config.get("tts", "rate", 150) if self.config and hasattr(self.config, 'get') else 150
-        volume = self.config.get("tts", "volume", 1.0) if self.config and hasattr(self.config, 'get') else 1.0
-        self.engine.setProperty('rate', rate)
-        self.engine.setProperty('volume', volume)
+        # Resolve settings from config if available, checking for it only once
+        get = self.config.get if self.config and hasattr(self.config, 'get') else None
+        rate = get("tts", "rate", 150) if get else 150
+        volume = get("tts", "volume", 1.0) if get else 1.0
+        voice_id = get("tts", "voice_id", None) if get else None
+        
+        # Window for merging back-to-back utterances into one; 0 disables merging
+        self._coalesce_ms = get("tts", "coalesce_ms", 20) if get else 20
+        
+        # On reinitialization, only push properties that actually changed
+        if not self._initialized or rate != self._rate:
+            self.engine.setProperty('rate', rate)
+        if not self._initialized or volume != self._volume:
+            self.engine.setProperty('volume', volume)
         
         # Set voice from config if available
-        voices = self.engine.getProperty('voices')
-        voice_id_str = self.config.get("tts", "voice_id", None) if self.config and hasattr(self.config, 'get') else None
+        if not self._initialized or voice_id != self._voice_id:
+            if voice_id:
+                self.engine.setProperty('voice', voice_id)
+            else:
+                voices = self.engine.getProperty('voices')
+                for voice in voices or []:
+                    if 'female' in voice.name.lower():
+                        self.engine.setProperty('voice', voice.id)
+                        break
+                        
+        self._rate = rate
+        self._volume = volume
+        self._voice_id = voice_id
         
-        if voice_id_str:
-            self.engine.setProperty('voice', voice_id_str)
-        elif voices:
-            for voice in voices:
-                if 'female' in voice.name.lower():
-                    self.engine.setProperty('voice', voice.id)
+        if not self._initialized:
+            # Connect callbacks once; reconnecting would fire them twice
+            self.engine.connect('started-word', self.on_start)
+            self.engine.connect('finished-utterance', self.on_finish)
+            self._initialized = True
+    
+    def _run(self):
+        """Speak queued text until shutdown() queues None."""
+        stopping = False
+        while not stopping and not self._stop_event.is_set():
+            text = self._queue.get()
+            if text is None:
+                break
+                
+            # Gather text queued shortly after so it is spoken in a single engine run
+            batch = [text]
+            deadline = time.monotonic() + self._coalesce_ms / 1000
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
                     break
+                batch.append(item)
+            text = " ".join(batch)
+                
+            # Announce speech before the engine starts, so listening is paused before any
+            # audio plays; the started-word callbacks that follow are ignored while speaking
+            self.on_start(None, 0, len(text))
+            try:
+                self.engine.say(text)
 
-        # Connect callbacks
-        self.engine.connect('started-word', self.on_start)
-        self.engine.connect('finished-flat', self.on_finish)
+                # Drive the engine loop by hand instead of runAndWait, sleeping between
+                # iterations so network threads get the GIL while speech plays
+                self.engine.startLoop(False)
+                try:
+                    while self.engine.isBusy():
+                        # Cut the current utterance short on shutdown; only this thread touches the engine
+                        if self._stop_event.is_set():
+                            self.engine.stop()
+                            break
+                        self.engine.iterate()
+                        time.sleep(0.005)
+                finally:
+                    self.engine.endLoop()
+            except RuntimeError:
+                # This can happen if the engine is busy or shutdown.
+                print(f"TTS engine error, could not say: {text}")
+            except Exception as e:
+                print(f"Error in speech task: {e}")
+            finally:
+                # Pair every speech_started with a speech_finished, even if the engine failed
+                # before reporting the end of the utterance
+                self.on_finish(None, False)
     
     def on_start(self, name, location, length):
         """Callback triggered when speech starts."""
@@ -71,8 +139,10 @@ class TextToSpeechModule(QObject):
             self.speech_started.emit()
 
     def on_finish(self, name, completed):
-        """Callback triggered when speech finishes."""
-        if self.speaking:
+        """Callback triggered when an utterance finishes."""
+        # With more text queued, the next batch continues the same stretch of speech;
+        # after shutdown nobody should resume listening
+        if self.speaking and self._queue.empty() and not self._stop_event.is_set():
             self.speaking = False
             self.speech_finished.emit()
 
@@ -84,18 +154,26 @@ class TextToSpeechModule(QObject):
             return
             
         print(f"Speaking: {text}")
-        task = SpeakTask(self.engine, text)
-        self.thread_pool.start(task)
+        self._queue.put_nowait(text)
     
     def shutdown(self):
         """
         Properly shut down the text-to-speech engine.
+        
+        Text not yet spoken is dropped and the worker stops the engine itself.
         """
+        self._stop_event.set()
+        
+        # Discard pending text so the worker reaches the sentinel straight away
         try:
-            self.engine.stop()
-        except Exception as e:
-            print(f"Error stopping engine: {e}")
-        self.thread_pool.waitForDone()
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        self._queue.put(None)
+        
+        # Don't hold up closing the window if the engine is slow to stop
+        self._worker.join(SHUTDOWN_WAIT_MS / 1000)
     
     def get_available_voices(self):
         """
@@ -3,29 +3,86 @@ AI Desktop Assistant - Weather Module
 Fetches and processes weather data.
 """
 
+import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Use orjson for response parsing if installed, otherwise the standard library
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Placeholder weather used when the API is unavailable; shared, so never modify it
+_DUMMY_WEATHER = {
+    'name': 'Example City',
+    'main': {
+        'temp': 20,
+        'feels_like': 19,
+        'temp_min': 18,
+        'temp_max': 22,
+        'humidity': 70
+    },
+    'weather': [
+        {
+            'main': 'Clear',
+            'description': 'clear sky'
+        }
+    ],
+    'wind': {
+        'speed': 3.5
+    }
+}
+
+# Shared by get_weather to run the current-weather and forecast requests side by side
+_fetch_pool = ThreadPoolExecutor(max_workers=2)
+
 class WeatherModule:
     """Handles fetching and processing of weather data."""
     
-    def __init__(self, config=None, api_key=None):
+    def __init__(self, config=None, api_key=None, executor=None):
         """
         Initialize the weather module.
         
         Args:
             config (AppConfig, optional): Application configuration object
             api_key (str, optional): OpenWeatherMap API key. If not provided, will try to get from environment.
+            executor (Executor, optional): Runs get_weather requests that have a callback.
+                A private pool is created if not provided.
         """
         self.config = config
+        self._owns_pool = executor is None
+        self._pool = executor or ThreadPoolExecutor(max_workers=4)
         # Use provided API key or get from environment
         self.api_key = api_key or os.getenv('WEATHER_API_KEY')
         self.base_url = "https://api.openweathermap.org/data/2.5"
+        self._weather_url = f"{self.base_url}/weather"
+        self._forecast_url = f"{self.base_url}/forecast"
+        
+        # Persistent session; get_weather issues two back-to-back requests to the same host
+        self._http = requests.Session()
+        self._http.mount("https://", HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=4,
+            max_retries=Retry(total=2, backoff_factor=0.2)
+        ))
+        self._http.headers.update({'Accept-Encoding': 'gzip'})
+        
+        # Recent responses, keyed by request type, location and units
+        self._weather_cache = TTLCache(maxsize=128, ttl=600)
         
         if not self.api_key:
-            print("Warning: No OpenWeatherMap API key provided. Weather functionality will be limited.")
+            logger.warning("No OpenWeatherMap API key provided. Weather functionality will be limited.")
     
     def get_current_weather(self, city=None, lat=None, lon=None, units="metric"):
         """
@@ -38,14 +95,15 @@ class WeatherModule:
             units (str): Units of measurement (metric, imperial, standard)
             
         Returns:
-            dict: Weather data dictionary or None if failed
+            dict: Weather data dictionary or None if failed. Cached responses are
+                shared between calls and must not be modified.
         """
         if not self.api_key:
-            print("Error: No OpenWeatherMap API key available.")
+            logger.error("No OpenWeatherMap API key available.")
             return self._get_dummy_weather()
             
         try:
-            url = f"{self.base_url}/weather"
+            url = self._weather_url
             params = {
                 'appid': self.api_key,
                 'units': units
@@ -58,16 +116,25 @@ class WeatherModule:
                 params['lat'] = lat
                 params['lon'] = lon
             else:
-                print("Error: No location provided.")
+                logger.error("No location provided.")
                 return self._get_dummy_weather()
                 
-            response = requests.get(url, params=params)
-            response.raise_for_status()
+            cache_key = ('weather', city or (lat, lon), units)
+            cached = self._weather_cache.get(cache_key)
+            if cached is not None:
+                return cached
+                
+            response = self._http.get(url, params=params, timeout=(2, 5))
+            if response.status_code >= 400:
+                logger.warning("Weather request failed with HTTP %s", response.status_code)
+                return self._get_dummy_weather()
             
-            return response.json()
+            data = _loads(response.content)
+            self._weather_cache.set(cache_key, data)
+            return data
             
-        except Exception as e:
-            print(f"Error fetching weather: {e}")
+        except (requests.RequestException, ValueError) as e:
+            logger.error("Error fetching weather: %s", e)
             return self._get_dummy_weather()
     
     def get_forecast(self, city=None, lat=None, lon=None, units="metric", days=5):
@@ -82,14 +149,15 @@ class WeatherModule:
             days (int): Number of days to forecast (max 5)
             
         Returns:
-            dict: Forecast data dictionary or None if failed
+            dict: Forecast data dictionary or None if failed. Cached responses are
+                shared between calls and must not be modified.
         """
         if not self.api_key:
-            print("Error: No OpenWeatherMap API key available.")
+            logger.error("No OpenWeatherMap API key available.")
             return None
             
         try:
-            url = f"{self.base_url}/forecast"
+            url = self._forecast_url
             params = {
                 'appid': self.api_key,
                 'units': units
@@ -102,44 +170,43 @@ class WeatherModule:
                 params['lat'] = lat
                 params['lon'] = lon
             else:
-                print("Error: No location provided.")
+                logger.error("No location provided.")
                 return None
                 
-            response = requests.get(url, params=params)
-            response.raise_for_status()
+            cache_key = ('forecast', city or (lat, lon), units)
+            cached = self._weather_cache.get(cache_key)
+            if cached is not None:
+                return cached
+                
+            response = self._http.get(url, params=params, timeout=(2, 5))
+            if response.status_code >= 400:
+                logger.warning("Forecast request failed with HTTP %s", response.status_code)
+                return None
             
-            return response.json()
+            data = _loads(response.content)
+            self._weather_cache.set(cache_key, data)
+            return data
             
-        except Exception as e:
-            print(f"Error fetching forecast: {e}")
+        except (requests.RequestException, ValueError) as e:
+            logger.error("Error fetching forecast: %s", e)
             return None
     
+    def close(self):
+        """
+        Close the HTTP session and its pooled connections.
+        """
+        if self._owns_pool:
+            self._pool.shutdown(wait=False)
+        self._http.close()
+    
     def _get_dummy_weather(self):
         """
         Get dummy weather data when API is unavailable.
         
         Returns:
-            dict: Dummy weather data dictionary
-        """
-        return {
-            'name': 'Example City',
-            'main': {
-                'temp': 20,
-                'feels_like': 19,
-                'temp_min': 18,
-                'temp_max': 22,
-                'humidity': 70
-            },
-            'weather': [
-                {
-                    'main': 'Clear',
-                    'description': 'clear sky'
-                }
-            ],
-            'wind': {
-                'speed': 3.5
-            }
-        }
+            dict: Dummy weather data dictionary, shared between calls; do not modify
+        """
+        return _DUMMY_WEATHER
     
     def format_weather_for_speech(self, weather_data):
         """
@@ -155,12 +222,17 @@ class WeatherModule:
             return "I couldn't retrieve the weather information at the moment."
             
         try:
+            # Pull out each sub-record once
+            main = weather_data.get('main') or {}
+            w0 = (weather_data.get('weather') or [{}])[0]
+            wind = weather_data.get('wind') or {}
+            
             city = weather_data.get('name', 'Unknown location')
-            temp = weather_data.get('main', {}).get('temp', 'unknown')
-            feels_like = weather_data.get('main', {}).get('feels_like', 'unknown')
-            conditions = weather_data.get('weather', [{}])[0].get('description', 'unknown conditions')
-            humidity = weather_data.get('main', {}).get('humidity', 'unknown')
-            wind_speed = weather_data.get('wind', {}).get('speed', 'unknown')
+            temp = main.get('temp', 'unknown')
+            feels_like = main.get('feels_like', 'unknown')
+            conditions = w0.get('description', 'unknown conditions')
+            humidity = main.get('humidity', 'unknown')
+            wind_speed = wind.get('speed', 'unknown')
             
             return (
                 f"The current weather in {city} is {temp} degrees with {conditions}. "
@@ -168,13 +240,31 @@ class WeatherModule:
                 f"Humidity is at {humidity}% and wind speed is {wind_speed} meters per second."
             )
         except Exception as e:
-            print(f"Error formatting weather data: {e}")
+            logger.error("Error formatting weather data: %s", e)
             return "I'm having trouble interpreting the weather data right now."
             
     def get_weather(self, location, callback=None):
         """
         Get weather for a location and process it using a callback.
         
+        With a callback the request runs on the module's executor and the callback
+        is called from that worker thread.
+        
+        Args:
+            location (str): Location to get weather for
+            callback (function): Optional callback function to handle the response
+            
+        Returns:
+            dict: Weather information dictionary, or a Future for it if a callback was given
+        """
+        if callback:
+            return self._pool.submit(self._get_weather_sync, location, callback)
+        return self._get_weather_sync(location)
+    
+    def _get_weather_sync(self, location, callback=None):
+        """
+        Fetch weather for a location on the calling thread.
+        
         Args:
             location (str): Location to get weather for
             callback (function): Optional callback function to handle the response
@@ -188,15 +278,22 @@ class WeatherModule:
             if self.config:
                 units = self.config.get("weather", "units", "metric")
                 
-            # Get the current weather
-            weather_data = self.get_current_weather(city=location, units=units)
+            # Request current weather and forecast concurrently; they are independent
+            current_future = _fetch_pool.submit(self.get_current_weather, city=location, units=units)
+            forecast_future = _fetch_pool.submit(self.get_forecast, city=location, units=units, days=1)
+            
+            # No extra timeout here: the session's (2, 5) timeouts and retries already bound
+            # each request, and a shorter wait would report slow successes as failures
+            weather_data = current_future.result()
             
             if not weather_data:
                 raise Exception("Failed to retrieve weather data")
                 
             # Extract relevant information
-            temperature = weather_data.get('main', {}).get('temp', 'N/A')
-            description = weather_data.get('weather', [{}])[0].get('description', 'N/A')
+            main = weather_data.get('main') or {}
+            w0 = (weather_data.get('weather') or [{}])[0]
+            temperature = main.get('temp', 'N/A')
+            description = w0.get('description', 'N/A')
             
             # Create response dictionary
             weather_info = {
@@ -209,12 +306,12 @@ class WeatherModule:
             
             # Add forecast if available
             try:
-                forecast_data = self.get_forecast(city=location, units=units, days=1)
+                forecast_data = forecast_future.result()
                 if forecast_data and 'list' in forecast_data and len(forecast_data['list']) > 0:
                     tomorrow = forecast_data['list'][4]  # Roughly 24 hours from now
                     weather_info["forecast"] = tomorrow.get('weather', [{}])[0].get('description', 'N/A')
             except Exception as e:
-                print(f"Error getting forecast: {e}")
+                logger.error("Error getting forecast: %s", e)
             
             # Call the callback if provided
             if callback:
@@ -223,7 +320,7 @@ class WeatherModule:
             return weather_info
             
         except Exception as e:
-            print(f"Error getting weather: {e}")
+            logger.error("Error getting weather: %s", e)
             
             # Create error response with dummy data
             dummy_data = self._get_dummy_weather()
@@ -0,0 +1,52 @@
+from unittest import TestCase, mock
+
+from utils.cache import TTLCache
+
+
+class TestTTLCache(TestCase):
+    def test_get_returns_stored_value(self):
+        cache = TTLCache(maxsize=4, ttl=10)
+        cache.set("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("missing", "default"), "default")
+
+    def test_entry_expires_after_ttl(self):
+        with mock.patch("utils.cache.time.monotonic", return_value=100.0) as monotonic:
+            cache = TTLCache(maxsize=4, ttl=10)
+            cache.set("a", 1)
+
+            monotonic.return_value = 109.9
+            self.assertEqual(cache.get("a"), 1)
+
+            monotonic.return_value = 110.1
+            self.assertIsNone(cache.get("a"))
+
+            # The expired entry is dropped, not just hidden
+            monotonic.return_value = 100.0
+            self.assertIsNone(cache.get("a"))
+
+    def test_oldest_entry_is_evicted_when_full(self):
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), 2)
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_setting_existing_key_makes_it_newest(self):
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("a", 10)
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 10)
+        self.assertIsNone(cache.get("b"))
+
+    def test_clear_removes_all_entries(self):
+        cache = TTLCache(maxsize=4, ttl=10)
+        cache.set("a", 1)
+        cache.clear()
+        self.assertIsNone(cache.get("a"))
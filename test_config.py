@@ -0,0 +1,84 @@
+import os
+import tempfile
+from unittest import TestCase, mock
+
+from utils.config import AppConfig
+
+
+class TestAppConfig(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.tmp_dir.name, "config.json")
+        self.config = AppConfig(self.config_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_clear_cache_picks_up_direct_edits(self):
+        self.assertEqual(self.config.get("news", "article_count"), 5)
+
+        self.config.get_all()["news"]["article_count"] = 9
+        self.config.clear_cache()
+
+        self.assertEqual(self.config.get("news", "article_count"), 9)
+
+    def test_batch_saves_once_on_exit(self):
+        self.config.get("news", "article_count")  # load and write the default config
+
+        with mock.patch.object(self.config, "save_config", wraps=self.config.save_config) as save:
+            with self.config.batch():
+                self.config.set("voice", "rate", 170)
+                self.config.set("voice", "volume", 0.5)
+                save.assert_not_called()
+            save.assert_called_once()
+
+        reloaded = AppConfig(self.config_path)
+        self.assertEqual(reloaded.get("voice", "rate"), 170)
+        self.assertEqual(reloaded.get("voice", "volume"), 0.5)
+
+    def test_nested_batch_saves_when_outermost_exits(self):
+        self.config.get("news", "article_count")
+
+        with mock.patch.object(self.config, "save_config", wraps=self.config.save_config) as save:
+            with self.config.batch():
+                with self.config.batch():
+                    self.config.set("voice", "rate", 170)
+                save.assert_not_called()
+            save.assert_called_once()
+
+    def test_batch_without_changes_does_not_save(self):
+        self.config.get("news", "article_count")
+
+        with mock.patch.object(self.config, "save_config") as save:
+            with self.config.batch():
+                pass
+            save.assert_not_called()
+
+    def test_set_same_value_skips_save(self):
+        self.config.get("news", "article_count")
+
+        with mock.patch.object(self.config, "save_config") as save:
+            self.config.set("news", "article_count", 5)
+            save.assert_not_called()
+
+    def test_set_equal_value_of_other_type_is_saved(self):
+        self.config.set("general", "voice_enabled", 1)
+
+        reloaded = AppConfig(self.config_path)
+        self.assertIs(type(reloaded.get("general", "voice_enabled")), int)
+
+    def test_keys_containing_dots_do_not_collide(self):
+        self.config.set("a", "b.c", 1)
+
+        self.assertIsNone(self.config.get("a.b", "c"))
+        self.assertEqual(self.config.get("a", "b.c"), 1)
+
+    def test_set_mutated_list_is_saved(self):
+        self.config.set("general", "items", ["a"])
+
+        items = self.config.get("general", "items")
+        items.append("b")
+        self.config.set("general", "items", items)
+
+        reloaded = AppConfig(self.config_path)
+        self.assertEqual(reloaded.get("general", "items"), ["a", "b"])
@@ -0,0 +1,30 @@
+from unittest import TestCase
+
+from modules.ai_module import KeywordProcessor
+
+
+class TestKeywordProcessor(TestCase):
+    def setUp(self):
+        self.processor = KeywordProcessor(case_sensitive=False)
+        self.processor.add_keyword("new", "new")
+        self.processor.add_keyword("new york", "city")
+        self.processor.add_keyword("news", "news")
+
+    def test_longest_match_wins(self):
+        self.assertEqual(self.processor.extract_keywords("flights to new york"), ["city"])
+        self.assertEqual(self.processor.extract_keywords("any news today"), ["news"])
+
+    def test_shorter_keyword_matches_when_longer_does_not(self):
+        self.assertEqual(self.processor.extract_keywords("new yorker"), ["new"])
+
+    def test_only_whole_words_match(self):
+        self.assertEqual(self.processor.extract_keywords("renew newsletter"), [])
+        self.assertEqual(self.processor.extract_keywords("news, new!"), ["news", "new"])
+
+    def test_matching_ignores_case(self):
+        self.assertEqual(self.processor.extract_keywords("NEW York NEWS"), ["city", "news"])
+
+    def test_case_sensitive_processor(self):
+        processor = KeywordProcessor(case_sensitive=True)
+        processor.add_keyword("NASA", "space")
+        self.assertEqual(processor.extract_keywords("nasa NASA"), ["space"])
@@ -3,10 +3,15 @@ AI Desktop Assistant - Main Window
 Implements the primary UI for the desktop assistant application.
 """
 
+from pathlib import Path
+
 from PyQt5.QtWidgets import QMainWindow, QVBoxLayout, QWidget, QPushButton, QLabel
-from PyQt5.QtCore import Qt, QSize, pyqtSignal
+from PyQt5.QtCore import Qt, QSize, QTimer, QSignalBlocker, pyqtSignal
 from PyQt5.QtGui import QIcon, QFont
 
+# Icon and theme stylesheets, located relative to this file rather than the working directory
+_RESOURCE_DIR = Path(__file__).resolve().parent.parent / "resources"
+
 class MainWindow(QMainWindow):
     """Main application window for the AI Desktop Assistant."""
     
@@ -15,79 +20,155 @@ class MainWindow(QMainWindow):
     stop_listening_signal = pyqtSignal()
     process_text_signal = pyqtSignal(str)
     
+    # Static widget settings, shared by every window instead of rebuilt in setup_ui
+    WINDOW_TITLE = "AI Desktop Assistant"
+    GREETING_TEXT = "Hello! How can I help you today?"
+    MIC_IDLE_TEXT = "Press to Speak"
+    MIC_LISTENING_TEXT = "Listening..."
+    MIC_BUTTON_SIZE = QSize(200, 50)
+    
+    # How each kind of message is shown in the response label
+    _ROLE_FMT = {
+        "assistant": "{}",
+        "user": "You: {}",
+        "speech": "You said: {}\n\nProcessing...",
+        "partial": "{}..."
+    }
+    
+    # Theme stylesheets, read once when the class is defined
+    _QSS = {
+        theme: (_RESOURCE_DIR / f"{theme}.qss").read_text(encoding="utf-8")
+        for theme in ("light", "dark")
+    }
+    
+    # Fonts shared by all windows, created on first use (a QApplication must exist)
+    _header_font = None
+    _body_font = None
+    
     def __init__(self, config, parent=None):
         super(MainWindow, self).__init__(parent)
         self.config = config
-        self.setWindowTitle("AI Desktop Assistant")
+        self.setWindowTitle(self.WINDOW_TITLE)
         self.setMinimumSize(800, 600)
         
         # Set window properties
-        self.setWindowIcon(QIcon("resources/icon.png"))
+        self.setWindowIcon(QIcon(str(_RESOURCE_DIR / "icon.png")))
         
         # Create central widget and layout
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
         self.layout = QVBoxLayout(self.central_widget)
         
+        # Latest response text waiting to be shown, or None when nothing is pending
+        self._pending_text = None
+        
         # Set up UI components
         self.setup_ui()
     
+    @classmethod
+    def _fonts(cls):
+        """Return the shared (header, body) fonts, creating them on first call."""
+        if cls._header_font is None:
+            cls._header_font = QFont("Arial", 24, QFont.Bold)
+            cls._body_font = QFont("Arial", 14)
+        return cls._header_font, cls._body_font
+    
     def setup_ui(self):
         """Set up the main user interface components."""
+        header_font, body_font = self._fonts()
+        
         # Header
-        header_label = QLabel("AI Desktop Assistant")
+        header_label = QLabel(self.WINDOW_TITLE)
         header_label.setAlignment(Qt.AlignCenter)
-        header_label.setFont(QFont("Arial", 24, QFont.Bold))
+        header_label.setFont(header_font)
         self.layout.addWidget(header_label)
         
-        # Placeholder for assistant interface
-        self.assistant_widget = QWidget()
-        self.assistant_layout = QVBoxLayout(self.assistant_widget)
-        
         # Assistant response area
-        self.response_label = QLabel("Hello! How can I help you today?")
+        self.response_label = QLabel(self.GREETING_TEXT)
         self.response_label.setAlignment(Qt.AlignCenter)
-        self.response_label.setFont(QFont("Arial", 14))
+        self.response_label.setFont(body_font)
         self.response_label.setWordWrap(True)
-        self.assistant_layout.addWidget(self.response_label)
+        # Responses are plain text and read-only: skip rich-text detection and text interaction
+        self.response_label.setTextFormat(Qt.PlainText)
+        self.response_label.setTextInteractionFlags(Qt.NoTextInteraction)
+        self.layout.addWidget(self.response_label)
         
         # Microphone button
-        self.mic_button = QPushButton("Press to Speak")
-        self.mic_button.setFixedSize(QSize(200, 50))
+        self.mic_button = QPushButton(self.MIC_IDLE_TEXT)
+        self.mic_button.setFixedSize(self.MIC_BUTTON_SIZE)
         self.mic_button.clicked.connect(self.on_mic_button_clicked)
-        self.assistant_layout.addWidget(self.mic_button, alignment=Qt.AlignCenter)
-        
-        self.layout.addWidget(self.assistant_widget)
+        self.layout.addWidget(self.mic_button, alignment=Qt.AlignCenter)
     
     def update_response(self, text):
-        """Update the assistant's response text."""
-        self.response_label.setText(text)
+        """
+        Update the assistant's response text.
+        
+        The label is updated once per event-loop pass, so several updates in a row
+        (e.g. the recognized text followed by the reply) cost a single relayout.
+        """
+        if self._pending_text is None:
+            QTimer.singleShot(0, self._flush_text)
+        self._pending_text = text
+    
+    def _flush_text(self):
+        """Show the latest pending response text."""
+        text, self._pending_text = self._pending_text, None
+        if text is not None:
+            self.response_label.setText(text)
         
+    def _post(self, role, message):
+        """
+        Show a message in the response label, formatted for its role.
+        
+        Args:
+            role (str): Key into _ROLE_FMT
+            message (str): Message text; empty messages are ignored
+            
+        Returns:
+            bool: Whether the message was shown
+        """
+        if not message:
+            return False
+        self.update_response(self._ROLE_FMT[role].format(message))
+        return True
+    
     def on_speech_recognized(self, text):
         """Handle recognized speech."""
-        if not text:
-            return
-            
-        # Update the UI with the recognized text
-        self.update_response(f"You said: {text}\n\nProcessing...")
-        
-        # Emit signal to process the text
-        self.process_text_signal.emit(text)
+        # Show the recognized text, then emit signal to process it
+        if self._post("speech", text):
+            self.process_text_signal.emit(text)
+    
+    def on_partial_recognized(self, text):
+        """Show an interim transcript while the user is still speaking."""
+        self._post("partial", text)
     
     def on_listening_started(self):
         """Handle when the assistant starts listening."""
         # Update UI to show that the assistant is listening
         self.update_response("Listening...")
-        self.mic_button.setEnabled(False)
-        self.mic_button.setText("Listening...")
+        self.set_mic_button_state(False, self.MIC_LISTENING_TEXT)
         
         # You could also update visuals or play a sound here
         
     def on_listening_ended(self):
         """Handle when the assistant stops listening."""
         # Reset the microphone button
-        self.mic_button.setEnabled(True)
-        self.mic_button.setText("Press to Speak")
+        self.set_mic_button_state(True, self.MIC_IDLE_TEXT)
+    
+    def set_mic_button_state(self, enabled, text):
+        """
+        Enable or disable the microphone button and set its label in one update.
+        
+        Signals are blocked and repaints suspended while both properties change,
+        so the button is restyled and repainted once rather than per property.
+        """
+        self.mic_button.setUpdatesEnabled(False)
+        try:
+            with QSignalBlocker(self.mic_button):
+                self.mic_button.setEnabled(enabled)
+                self.mic_button.setText(text)
+        finally:
+            self.mic_button.setUpdatesEnabled(True)
     
     def on_mic_button_clicked(self):
         """Handle microphone button click."""
@@ -96,72 +177,17 @@ class MainWindow(QMainWindow):
         
     def add_assistant_message(self, message):
         """Add an assistant message to the conversation."""
-        if not message:
-            return
-        
-        # Update the response label with the assistant's message
-        self.update_response(message)
+        self._post("assistant", message)
         
     def add_user_message(self, message):
         """Add a user message to the conversation."""
-        if not message:
-            return
-            
-        # Update the response label with the user's message
         # In a more complex UI, this would add to a conversation view
-        self.update_response(f"You: {message}")
+        self._post("user", message)
     
     def set_light_theme(self):
         """Apply light theme to the application."""
-        # Set light theme colors and styles
-        self.setStyleSheet("""
-            QMainWindow, QWidget {
-                background-color: #f5f5f5;
-                color: #333333;
-            }
-            QPushButton {
-                background-color: #0078d7;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 8px 16px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #005a9e;
-            }
-            QPushButton:disabled {
-                background-color: #cccccc;
-            }
-            QLabel {
-                color: #333333;
-            }
-        """)
+        self.setStyleSheet(self._QSS["light"])
     
     def set_dark_theme(self):
         """Apply dark theme to the application."""
-        # Set dark theme colors and styles
-        self.setStyleSheet("""
-            QMainWindow, QWidget {
-                background-color: #333333;
-                color: #f5f5f5;
-            }
-            QPushButton {
-                background-color: #0078d7;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 8px 16px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #005a9e;
-            }
-            QPushButton:disabled {
-                background-color: #505050;
-                color: #aaaaaa;
-            }
-            QLabel {
-                color: #f5f5f5;
-            }
-        """)
+        self.setStyleSheet(self._QSS["dark"])
@@ -0,0 +1,67 @@
+"""
+AI Desktop Assistant - Cache Module
+Provides a small in-memory cache whose entries expire after a fixed time.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+class TTLCache:
+    """Thread-safe in-memory cache with per-entry expiry."""
+
+    def __init__(self, maxsize=128, ttl=600):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize (int): Maximum number of entries; the oldest is evicted when full
+            ttl (float): Number of seconds an entry stays valid
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+            default: Value returned if the key is missing or expired
+
+        Returns:
+            Cached value or default
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key, value):
+        """
+        Store a value, replacing any existing entry for the key.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove all entries.
+        """
+        with self._lock:
+            self._data.clear()
@@ -4,9 +4,72 @@ Handles application configuration and settings.
 """
 
 import os
+import sys
 import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from contextlib import contextmanager
 from pathlib import Path
 
+# Read and write the config with orjson when available, otherwise the standard library
+try:
+    import orjson
+    _loads = orjson.loads
+    
+    def _dumps(data):
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _loads = json.loads
+    
+    def _dumps(data):
+        return json.dumps(data, indent=4).encode("utf-8")
+
+# Default settings, read-only; create_default_config copies them per instance.
+# All values are immutable, so copying each section is enough.
+_DEFAULT_CONFIG = MappingProxyType({
+    "general": MappingProxyType({
+        "voice_enabled": True,
+        "startup_greeting": True,
+        "theme": "default",
+        "log_level": "WARNING"
+    }),
+    "voice": MappingProxyType({
+        "rate": 150,
+        "volume": 1.0,
+        "preferred_voice": None
+    }),
+    "weather": MappingProxyType({
+        "default_location": None,
+        "units": "metric"  # metric, imperial, standard
+    }),
+    "news": MappingProxyType({
+        "default_country": "us",
+        "default_category": "general",
+        "article_count": 5
+    })
+})
+
+# Value types set() may treat as unchanged; containers can be mutated in place after get()
+_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+def _intern_keys(data):
+    """
+    Intern the keys of a parsed config, recursing into nested dictionaries.
+    
+    Args:
+        data (dict): Parsed configuration
+        
+    Returns:
+        dict: Copy of data whose keys are interned strings
+    """
+    return {
+        (sys.intern(key) if isinstance(key, str) else key):
+            (_intern_keys(value) if isinstance(value, dict) else value)
+        for key, value in data.items()
+    }
+
 class AppConfig:
     """Manages application configuration and settings."""
     
@@ -20,6 +83,9 @@ class AppConfig:
         """
         self.config_data = {}
         
+        # Flat view of config_data keyed by (section, key) for single-lookup reads
+        self._flat = {}
+        
         # Set default config file location if not provided
         if not config_file:
             app_dir = Path.home() / ".ai_assistant"
@@ -28,49 +94,86 @@ class AppConfig:
         else:
             self.config_file = Path(config_file)
         
-        # Load config or create default
-        self.load_config()
+        # The file is read and parsed in the background while the caller carries on;
+        # the first access waits for it
+        self._loaded = False
+        self._loading = False
+        self._load_lock = threading.RLock()
+        prefetch_pool = ThreadPoolExecutor(max_workers=1)
+        self._prefetch = prefetch_pool.submit(self._read_config_file)
+        prefetch_pool.shutdown(wait=False)
+        
+        # Writes inside batch() are deferred until the outermost batch exits
+        self._batch_depth = 0
+        self._dirty = False
+        
+        # Hash of the last content written, to skip saves that change nothing
+        self._last_hash = None
+    
+    def _ensure_loaded(self):
+        """
+        Load the configuration if it hasn't been loaded yet.
+        """
+        if self._loaded:
+            return
+            
+        with self._load_lock:
+            # load_config may save a default config, which comes back here on this thread
+            if self._loaded or self._loading:
+                return
+            self._loading = True
+            try:
+                self.load_config()
+            finally:
+                self._loading = False
+                self._loaded = True
+    
+    def _read_config_file(self):
+        """
+        Read and parse the configuration file.
+        
+        Returns:
+            dict: Parsed configuration, or None if the file doesn't exist
+        """
+        if not self.config_file.exists():
+            return None
+        return _loads(self.config_file.read_bytes())
     
     def load_config(self):
         """
         Load configuration from file or create default if file doesn't exist.
         """
         try:
-            if self.config_file.exists():
-                with open(self.config_file, 'r') as f:
-                    self.config_data = json.load(f)
+            # Use the background read from __init__ the first time, then read afresh
+            prefetch, self._prefetch = self._prefetch, None
+            data = prefetch.result() if prefetch else self._read_config_file()
+            if data is not None:
+                self.config_data = _intern_keys(data)
             else:
                 self.create_default_config()
                 self.save_config()
         except Exception as e:
             print(f"Error loading configuration: {e}")
             self.create_default_config()
+            
+        self._rebuild_flat()
+    
+    def _rebuild_flat(self):
+        """
+        Rebuild the flat (section, key) lookup dictionary from config_data.
+        """
+        self._flat = {
+            (section, key): value
+            for section, values in self.config_data.items()
+            if isinstance(values, dict)
+            for key, value in values.items()
+        }
     
     def create_default_config(self):
         """
         Create default configuration.
         """
-        self.config_data = {
-            "general": {
-                "voice_enabled": True,
-                "startup_greeting": True,
-                "theme": "default"
-            },
-            "voice": {
-                "rate": 150,
-                "volume": 1.0,
-                "preferred_voice": None
-            },
-            "weather": {
-                "default_location": None,
-                "units": "metric"  # metric, imperial, standard
-            },
-            "news": {
-                "default_country": "us",
-                "default_category": "general",
-                "article_count": 5
-            }
-        }
+        self.config_data = {section: dict(values) for section, values in _DEFAULT_CONFIG.items()}
     
     def save_config(self):
         """
@@ -79,9 +182,18 @@ class AppConfig:
         Returns:
             bool: Success status
         """
+        self._ensure_loaded()
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(self.config_data, f, indent=4)
+            data = _dumps(self.config_data)
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+            if digest != self._last_hash:
+                # Write a sibling file and swap it in, so a crash never leaves a partial config
+                tmp_file = self.config_file.with_name(self.config_file.name + ".tmp")
+                tmp_file.write_bytes(data)
+                os.replace(tmp_file, self.config_file)
+                self._last_hash = digest
+                
+            self._dirty = False
             return True
         except Exception as e:
             print(f"Error saving configuration: {e}")
@@ -99,7 +211,16 @@ class AppConfig:
         Returns:
             Value from configuration or default
         """
-        return self.config_data.get(section, {}).get(key, default)
+        self._ensure_loaded()
+        return self._flat.get((section, key), default)
+    
+    def clear_cache(self):
+        """
+        Resync get() with config_data, e.g. after editing config_data directly.
+        
+        Rebuilds the flat lookup dictionary get() reads from.
+        """
+        self._rebuild_flat()
     
     def set(self, section, key, value):
         """
@@ -113,12 +234,58 @@ class AppConfig:
         Returns:
             bool: Success status
         """
+        self._ensure_loaded()
+        
+        # Setting a scalar to the value it already has changes nothing, so skip the save
+        # (compare types too, since 1 == True == 1.0 but they save differently). Lists and
+        # dicts are always saved: the stored object may be the one the caller just mutated.
+        flat_key = (section, key)
+        if flat_key in self._flat and type(value) in _SCALAR_TYPES:
+            old_value = self._flat[flat_key]
+            if type(old_value) is type(value) and old_value == value:
+                return True
+            
         if section not in self.config_data:
             self.config_data[section] = {}
             
         self.config_data[section][key] = value
+        self._flat[flat_key] = value
+        self._dirty = True
+        if self._batch_depth:
+            return True
         return self.save_config()
     
+    @contextmanager
+    def batch(self):
+        """
+        Group several set() calls into a single save.
+        
+        The file is written once when the outermost batch exits, if anything changed.
+        
+        Example:
+            with config.batch():
+                config.set("voice", "rate", 170)
+                config.set("voice", "volume", 0.8)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.flush()
+    
+    def flush(self):
+        """
+        Save pending changes, if there are any.
+        
+        Returns:
+            bool: Success status
+        """
+        if self._dirty:
+            return self.save_config()
+        return True
+    
     def get_all(self):
         """
         Get all configuration data.
@@ -126,4 +293,5 @@ class AppConfig:
         Returns:
             dict: All configuration data
         """
+        self._ensure_loaded()
         return self.config_data